@@ -324,13 +324,9 @@ export const ChatProvider: React.FC<ChatProviderProps> = ({ children }) => {
     }
   };
 
+  // Each request gets its own data store server-side, so only local state needs clearing
   const clearCurrentData = async () => {
-    try {
-      await chatAPI.clearData();
-      setDataStore({});
-    } catch (error) {
-      console.error('Failed to clear data:', error);
-    }
+    setDataStore({});
   };
 
   const value: ChatContextType = {
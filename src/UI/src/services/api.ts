@@ -122,11 +122,6 @@ export const chatAPI = {
     return response.data;
   },
 
-  clearData: async () => {
-    const response = await api.delete('/chat/clear-data');
-    return response.data;
-  },
-
   // Streaming chat (using fetch API for SSE support)
   sendMessageStream: async (
     data: ChatRequest,
@@ -0,0 +1,49 @@
+"""Add (thread_id, created_at DESC) index on checkpoints
+
+Revision ID: 3f9c2d7a1e64
+Revises: b25056d029bd
+Create Date: 2026-10-14 11:02:17.318649
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9c2d7a1e64'
+down_revision: Union[str, Sequence[str], None] = 'b25056d029bd'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEX = 'idx_thread_created_desc'
+
+
+def _has_checkpoints() -> bool:
+    # The table is created by init_db() on startup, so it may not exist yet
+    return sa.inspect(op.get_bind()).has_table('checkpoints')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if not _has_checkpoints():
+        return
+    # CREATE INDEX CONCURRENTLY can't run inside a transaction, but it doesn't
+    # block checkpoint writes while the index builds
+    with op.get_context().autocommit_block():
+        op.create_index(
+            INDEX,
+            'checkpoints',
+            ['thread_id', sa.text('created_at DESC')],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if not _has_checkpoints():
+        return
+    with op.get_context().autocommit_block():
+        op.drop_index(INDEX, table_name='checkpoints', postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,51 @@
+"""Store checkpoint data as MessagePack
+
+Revision ID: b25056d029bd
+Revises: 80751f0c534b
+Create Date: 2026-10-14 09:12:41.503217
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b25056d029bd'
+down_revision: Union[str, Sequence[str], None] = '80751f0c534b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = ('checkpoint_data', 'checkpoint_metadata')
+
+
+def _has_checkpoints() -> bool:
+    # The table is created by init_db() on startup, so it may not exist yet
+    return sa.inspect(op.get_bind()).has_table('checkpoints')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if not _has_checkpoints():
+        return
+    # Existing rows keep their JSON text as bytes; the MsgPack column type
+    # recognises them by the leading '{' and decodes them as JSON
+    for column in COLUMNS:
+        op.execute(
+            f"ALTER TABLE checkpoints ALTER COLUMN {column} TYPE BYTEA "
+            f"USING convert_to({column}::text, 'UTF8')"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if not _has_checkpoints():
+        return
+    # Only rows still holding JSON text can be converted back; MessagePack rows are dropped
+    for column in COLUMNS:
+        op.execute(f"DELETE FROM checkpoints WHERE get_byte({column}, 0) <> 123")
+        op.execute(
+            f"ALTER TABLE checkpoints ALTER COLUMN {column} TYPE JSONB "
+            f"USING convert_from({column}, 'UTF8')::jsonb"
+        )
@@ -5,10 +5,12 @@ Handles AI agent chat interactions for travel planning
 """
 
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import ORJSONResponse, StreamingResponse
 import logging
-import uuid
+import secrets
+import orjson
 
-from services import chat, get_conversation_history, clear_data_store
+from services import chat, chat_stream, get_conversation_history
 from models import ChatRequest, ChatResponse, HistoryResponse
 
 # Configure logging
@@ -19,7 +21,7 @@ router = APIRouter(prefix="/chat", tags=["Chat"])
 
 # ===== ENDPOINTS =====
 
-@router.post("/", response_model=ChatResponse)
+@router.post("/", response_model=ChatResponse, response_class=ORJSONResponse)
 async def chat_endpoint(request: ChatRequest):
     """
     Chat with the Travel Planning AI Agent
@@ -33,26 +35,23 @@ async def chat_endpoint(request: ChatRequest):
     """
     try:
         # Generate thread_id if not provided
-        thread_id = request.thread_id or f"session-{uuid.uuid4().hex[:12]}"
+        thread_id = request.thread_id or f"session-{secrets.token_hex(6)}"
 
-        logger.info("\n" + "=" * 100)
-        logger.info("🚀 NEW CHAT REQUEST")
-        logger.info(f"   Thread ID: {thread_id}")
-        logger.info(f"   User Message: {request.message}")
-        logger.info("=" * 100)
+        logger.info("🚀 Chat request on thread %s", thread_id)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("   User Message: %s", request.message)
 
         # Get response from agent (now async)
         result = await chat(
             user_message=request.message,
-            thread_id=thread_id
+            thread_id=thread_id,
+            known_keys=request.known_keys
         )
 
-        logger.info("\n" + "=" * 100)
-        logger.info("✅ CHAT REQUEST COMPLETED")
-        logger.info(f"   Thread ID: {thread_id}")
-        logger.info(f"   Agent Response: {result['response'][:200]}...")
-        logger.info(f"   Data Store Keys: {list(result.get('data_store', {}).keys())}")
-        logger.info("=" * 100 + "\n")
+        logger.info("✅ Chat request completed on thread %s", thread_id)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("   Agent Response: %s...", result['response'][:200])
+            logger.debug("   Data Store Keys: %s", list(result.get('data_store', {}).keys()))
 
         return ChatResponse(
             response=result["response"],
@@ -61,13 +60,42 @@ async def chat_endpoint(request: ChatRequest):
         )
 
     except Exception as e:
-        logger.error(f"❌ Error processing chat request: {str(e)}", exc_info=True)
+        logger.error("❌ Error processing chat request: %s", e, exc_info=True)
         raise HTTPException(
             status_code=500,
             detail=f"Error processing chat request: {str(e)}"
         )
 
 
+@router.post("/stream")
+async def chat_stream_endpoint(request: ChatRequest):
+    """
+    Chat with the Travel Planning AI Agent, streaming the reply
+
+    Sends Server-Sent Events as the agent runs: "token" events carry LLM
+    tokens, "tool_end" marks a finished search, and a final "done" event
+    carries the full response, thread_id and data_store.
+    """
+    # Generate thread_id if not provided
+    thread_id = request.thread_id or f"session-{secrets.token_hex(6)}"
+
+    logger.info("🚀 Streaming chat request on thread %s", thread_id)
+
+    async def event_source():
+        try:
+            async for event in chat_stream(user_message=request.message, thread_id=thread_id, known_keys=request.known_keys):
+                if event["type"] == "done":
+                    event = {**event, "thread_id": thread_id}
+                yield b"data: " + orjson.dumps(event) + b"\n\n"
+        except Exception as e:
+            # Tracebacks only when debugging, as in the services
+            logger.error("❌ Error streaming chat request: %s", e, exc_info=logger.isEnabledFor(logging.DEBUG))
+            error = {"type": "error", "detail": f"Error processing chat request: {str(e)}"}
+            yield b"data: " + orjson.dumps(error) + b"\n\n"
+
+    return StreamingResponse(event_source(), media_type="text/event-stream")
+
+
 @router.get("/history/{thread_id}", response_model=HistoryResponse)
 async def get_history(thread_id: str):
     """
@@ -76,9 +104,9 @@ async def get_history(thread_id: str):
     Returns all messages in the conversation.
     """
     try:
-        logger.info(f"📖 Retrieving history for thread: {thread_id}")
-        messages = get_conversation_history(thread_id)
-        logger.info(f"📖 Found {len(messages)} messages")
+        logger.info("📖 Retrieving history for thread: %s", thread_id)
+        messages = await get_conversation_history(thread_id)
+        logger.info("📖 Found %d messages", len(messages))
 
         # Convert LangChain messages to dict format
         formatted_messages = []
@@ -94,26 +122,8 @@ async def get_history(thread_id: str):
         )
 
     except Exception as e:
-        logger.error(f"❌ Error retrieving conversation history: {e}", exc_info=True)
+        logger.error("❌ Error retrieving conversation history: %s", e, exc_info=True)
         raise HTTPException(
             status_code=500,
             detail=f"Error retrieving conversation history: {str(e)}"
         )
-
-
-@router.delete("/clear-data")
-async def clear_data():
-    """
-    Clear the data store
-
-    Useful for resetting between test sessions or clearing cached data.
-    """
-    try:
-        clear_data_store()
-        return {"status": "success", "message": "Data store cleared"}
-
-    except Exception as e:
-        raise HTTPException(
-            status_code=500,
-            detail=f"Error clearing data store: {str(e)}"
-        )
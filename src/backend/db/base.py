@@ -22,18 +22,37 @@ DATABASE_URL = os.getenv(
 # Sync database URL (for checkpointer)
 SYNC_DATABASE_URL = DATABASE_URL.replace("+asyncpg", "").replace("postgresql://", "postgresql+psycopg2://")
 
-# Create async engine
+# Log every SQL statement only when explicitly requested (SQL_ECHO=1)
+SQL_ECHO = os.getenv("SQL_ECHO", "0") == "1"
+
+# Connection pool tuning, shared by both engines
+PG_POOL_SIZE = int(os.getenv("PG_POOL_SIZE", "20"))
+PG_MAX_OVERFLOW = int(os.getenv("PG_MAX_OVERFLOW", "40"))
+PG_POOL_RECYCLE = int(os.getenv("PG_POOL_RECYCLE", "1800"))  # Seconds before a connection is replaced
+
+
+# Create async engine (shared by the API and the agent's checkpointer)
 engine = create_async_engine(
     DATABASE_URL,
-    echo=True,  # Set to False in production
-    future=True
+    echo=SQL_ECHO,
+    future=True,
+    pool_size=PG_POOL_SIZE,
+    max_overflow=PG_MAX_OVERFLOW,
+    pool_pre_ping=True,             # Drop connections the server has closed
+    pool_recycle=PG_POOL_RECYCLE
 )
 
 # Create sync engine (for checkpointer that needs sync operations)
 sync_engine = create_engine(
     SYNC_DATABASE_URL,
     echo=False,
-    future=True
+    future=True,
+    pool_size=PG_POOL_SIZE,
+    max_overflow=PG_MAX_OVERFLOW,
+    pool_pre_ping=True,
+    pool_recycle=PG_POOL_RECYCLE,
+    # TCP keepalives so idle pooled connections aren't silently dropped
+    connect_args={"keepalives": 1, "keepalives_idle": 30, "keepalives_interval": 10, "keepalives_count": 5}
 )
 
 # Create async session factory
@@ -90,7 +109,7 @@ async def init_db():
             await conn.run_sync(Base.metadata.create_all)
             logger.info("✅ Database tables created/verified successfully")
     except Exception as e:
-        logger.error(f"❌ Error initializing database: {e}", exc_info=True)
+        logger.error("❌ Error initializing database: %s", e, exc_info=True)
         raise
 
 
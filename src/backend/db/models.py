@@ -3,12 +3,40 @@ Database models
 """
 
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, ForeignKey, Index
+import msgpack
+import orjson
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, Index, LargeBinary
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
+from sqlalchemy.types import TypeDecorator
 from .base import Base
 
 
+class MsgPack(TypeDecorator):
+    """
+    Stores a JSON-like value as MessagePack in a BYTEA column.
+
+    Packed dicts always start with a map marker (0x80-0x8f, 0xde, 0xdf), so rows
+    still holding JSON text (first byte b'{') are told apart and decoded as JSON.
+    """
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return msgpack.packb(value, use_bin_type=True)
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        value = bytes(value)
+        if value[:1] == b"{":
+            return orjson.loads(value)
+        return msgpack.unpackb(value, raw=False, strict_map_key=False)
+
+
 class User(Base):
     """User model for authentication and profile"""
 
@@ -25,7 +53,11 @@ class User(Base):
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     # Relationships
-    conversations = relationship("Conversation", back_populates="user", cascade="all, delete-orphan")
+    # Collections must be eager-loaded explicitly (e.g. selectinload); deletes cascade in the DB
+    conversations = relationship(
+        "Conversation", back_populates="user", cascade="all, delete-orphan",
+        lazy="raise_on_sql", passive_deletes=True
+    )
 
     def __repr__(self):
         return f"<User(id={self.id}, email='{self.email}', username='{self.username}')>"
@@ -45,7 +77,10 @@ class Conversation(Base):
 
     # Relationships
     user = relationship("User", back_populates="conversations")
-    checkpoints = relationship("Checkpoint", back_populates="conversation", cascade="all, delete-orphan")
+    checkpoints = relationship(
+        "Checkpoint", back_populates="conversation", cascade="all, delete-orphan",
+        lazy="raise_on_sql", passive_deletes=True
+    )
 
     def __repr__(self):
         return f"<Conversation(id={self.id}, thread_id='{self.thread_id}')>"
@@ -60,16 +95,18 @@ class Checkpoint(Base):
     thread_id = Column(String, ForeignKey("conversations.thread_id", ondelete="CASCADE"), nullable=False, index=True)
     checkpoint_id = Column(String, nullable=False)  # LangGraph checkpoint ID
     parent_checkpoint_id = Column(String, nullable=True)  # Parent checkpoint for branching
-    checkpoint_data = Column(Text, nullable=False)  # JSON serialized checkpoint data
-    checkpoint_metadata = Column(Text, nullable=True)  # JSON serialized metadata (renamed to avoid SQLAlchemy reserved word)
+    checkpoint_data = Column(MsgPack, nullable=False)  # Checkpoint data
+    checkpoint_metadata = Column(MsgPack, nullable=True)  # Metadata (renamed to avoid SQLAlchemy reserved word)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     # Relationships
     conversation = relationship("Conversation", back_populates="checkpoints")
 
-    # Composite index for efficient lookups
+    # Composite indexes for efficient lookups
     __table_args__ = (
         Index('idx_thread_checkpoint', 'thread_id', 'checkpoint_id'),
+        # Serves "latest checkpoint for thread" (ORDER BY created_at DESC LIMIT 1)
+        Index('idx_thread_created_desc', 'thread_id', created_at.desc()),
     )
 
     def __repr__(self):
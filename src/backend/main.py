@@ -11,7 +11,7 @@ import os
 import logging
 
 # Import routers
-from api.v1.routes import chat, data, auth
+from api.v1.routes import chat, auth
 
 # Import database initialization
 from db.base import init_db, close_db
@@ -43,9 +43,17 @@ app = FastAPI(
 )
 
 # CORS middleware
+# Explicit allowlist (comma-separated): browsers reject "*" with credentials anyway,
+# and a concrete list lets Starlette answer with a plain set lookup
+CORS_ALLOW_ORIGINS = [
+    origin.strip()
+    for origin in (os.getenv("CORS_ALLOW_ORIGINS") or "http://localhost:3000").split(",")
+    if origin.strip()
+]
+
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # Update this in production
+    allow_origins=CORS_ALLOW_ORIGINS,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
@@ -58,6 +66,13 @@ async def startup_event():
     """Initialize database on application startup"""
     logger.info("🚀 Starting TPA API...")
     await init_db()
+
+    # Batch the agent's checkpoint writes in the background
+    from services import _http, ai_service
+    await ai_service.start_checkpoint_writer()
+
+    # Connect to SearchAPI now so the first search skips the handshake
+    await _http.warm_http_client()
     logger.info("✅ TPA API ready!")
 
 
@@ -66,16 +81,29 @@ async def startup_event():
 async def shutdown_event():
     """Close database connections and HTTP clients on application shutdown"""
     logger.info("🛑 Shutting down TPA API...")
+
+    # Write out queued checkpoints while the database is still open
+    try:
+        from services import ai_service
+        await ai_service.close_checkpoint_writer()
+    except Exception as e:
+        logger.warning("⚠️ Error draining checkpoint writer: %s", e)
     
     # Close HTTP clients from services
     try:
-        from services import flight_service, hotel_service, news_service
-        await flight_service.close_http_client()
-        await hotel_service.close_http_client()
-        await news_service.close_http_client()
+        from services import _http, ai_service
+        await _http.close_http_client()
+        await ai_service.close_openai_client()
         logger.info("✅ HTTP clients closed")
     except Exception as e:
-        logger.warning(f"⚠️ Error closing HTTP clients: {e}")
+        logger.warning("⚠️ Error closing HTTP clients: %s", e)
+
+    # Close the Redis response cache
+    try:
+        from services import cache
+        await cache.close_redis_client()
+    except Exception as e:
+        logger.warning("⚠️ Error closing Redis client: %s", e)
     
     # Close database connections
     await close_db()
@@ -85,7 +113,6 @@ async def shutdown_event():
 # Include routers
 app.include_router(auth.router, prefix="/api/v1")
 app.include_router(chat.router, prefix="/api/v1")
-app.include_router(data.router, prefix="/api/v1")
 
 
 # Root endpoint
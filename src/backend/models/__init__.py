@@ -3,14 +3,12 @@ Pydantic models for API requests and responses
 """
 
 from .chat import ChatRequest, ChatResponse, HistoryResponse
-from .data import DataResponse
 from .user import UserCreate, UserUpdate, UserResponse, Token, TokenData
 
 __all__ = [
     'ChatRequest',
     'ChatResponse',
     'HistoryResponse',
-    'DataResponse',
     'UserCreate',
     'UserUpdate',
     'UserResponse',
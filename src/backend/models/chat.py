@@ -3,13 +3,17 @@ Chat-related Pydantic models
 """
 
 from pydantic import BaseModel, Field
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 
 
 class ChatRequest(BaseModel):
     """Request model for chat endpoint"""
     message: str = Field(..., description="User's message", min_length=1)
     thread_id: Optional[str] = Field(None, description="Conversation thread ID (auto-generated if not provided)")
+    known_keys: Optional[Dict[str, List[str]]] = Field(
+        None,
+        description="data_store keys the client already holds, per data type; these entries are not sent again"
+    )
 
     model_config = {
         "json_schema_extra": {
@@ -12,8 +12,7 @@ Contains all business logic for:
 # AI Service exports
 from .ai_service import (
     chat,
-    get_stored_data,
-    clear_data_store,
+    chat_stream,
     get_conversation_history,
     agent
 )
@@ -27,8 +26,7 @@ from . import config
 __all__ = [
     # AI Agent functions
     'chat',
-    'get_stored_data',
-    'clear_data_store',
+    'chat_stream',
     'get_conversation_history',
     'agent',
 
@@ -0,0 +1,164 @@
+"""
+Shared HTTP client for SearchAPI.io
+
+Flight, hotel and news searches all hit the same host, so they share one
+connection pool: the fan-out from a single agent turn reuses warm
+keep-alive connections instead of each service opening its own.
+"""
+
+import asyncio
+import logging
+import os
+import uuid
+from pathlib import Path
+from types import MappingProxyType
+
+import httpx
+
+try:
+    import uvloop
+except ImportError:  # Not available on Windows
+    uvloop = None
+
+try:
+    from .config import config
+except ImportError:
+    from config import config
+
+logger = logging.getLogger(__name__)
+
+# Each is tied to the event loop it was created on (see _on_current_loop)
+_http_client = None
+_http_client_loop = None
+_serp_semaphore = None
+_serp_semaphore_loop = None
+
+# Loop factory for asyncio.run() in standalone scripts; uvicorn already picks
+# uvloop on its own when it is installed
+LOOP_FACTORY = uvloop.new_event_loop if uvloop is not None else None
+
+# The API key never changes at runtime, so the auth header is built once
+AUTH_HEADERS = MappingProxyType({"Authorization": f"Bearer {config.serp_key}"})
+
+
+def _running_loop() -> asyncio.AbstractEventLoop | None:
+    """The running event loop, or None outside of one"""
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+def _on_current_loop(loop) -> bool:
+    """
+    Whether an object created on `loop` can be used from the running loop
+
+    Pooled connections and semaphores belong to one event loop; reusing them
+    after a second asyncio.run() raises "Event loop is closed".
+    """
+    return loop is _running_loop()
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get or create the shared HTTP client for the running event loop"""
+    global _http_client, _http_client_loop
+    if _http_client is None or not _on_current_loop(_http_client_loop):
+        # A client left over from a finished loop can't be closed from this one;
+        # its sockets are dropped along with it.
+        # Pool settings go on the transport: httpx ignores the client's
+        # limits/http2 arguments when a custom transport is supplied
+        # Creation is synchronous (no await), so concurrent callers can't race
+        # each other into building two clients
+        _http_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(connect=5.0, read=30.0, write=10.0, pool=5.0),
+            headers={"User-Agent": "tpa/1.0"},
+            transport=httpx.AsyncHTTPTransport(
+                retries=2,
+                http2=True,
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=50, keepalive_expiry=60.0),
+            ),
+        )
+        _http_client_loop = _running_loop()
+    return _http_client
+
+
+async def warm_http_client():
+    """
+    Open a keep-alive connection to SearchAPI ahead of the first search
+
+    DNS, TCP, TLS and HTTP/2 setup happen here instead of on a user's request.
+    The response itself is irrelevant, and failures are only logged.
+    """
+    try:
+        await get_http_client().head(config.base_api_url, headers=AUTH_HEADERS)
+    except httpx.HTTPError as e:
+        logger.debug("HTTP client warm-up failed: %s", e)
+
+
+def get_serp_semaphore() -> asyncio.Semaphore:
+    """Get or create the semaphore that caps concurrent SearchAPI requests"""
+    global _serp_semaphore, _serp_semaphore_loop
+    if _serp_semaphore is None or not _on_current_loop(_serp_semaphore_loop):
+        _serp_semaphore = asyncio.Semaphore(config.serp_concurrency)
+        _serp_semaphore_loop = _running_loop()
+    return _serp_semaphore
+
+
+async def coalesce(inflight: dict, key, call):
+    """
+    Run call() once for all concurrent callers with the same key
+
+    Callers that arrive while a call for key is running await its result (or
+    exception) instead of starting their own. The entry is removed when the
+    call finishes, so later callers start fresh rather than joining a stale one.
+    """
+    future = inflight.get(key)
+    if future is not None:
+        return await asyncio.shield(future)
+
+    future = asyncio.get_running_loop().create_future()
+    inflight[key] = future
+    try:
+        result = await call()
+    except Exception as e:
+        future.set_exception(e)
+        future.exception()  # Mark retrieved so a call with no followers doesn't warn
+        raise
+    else:
+        future.set_result(result)
+    finally:
+        inflight.pop(key, None)
+        if not future.done():
+            future.cancel()
+    return result
+
+
+async def dump_response(name: str, body: bytes) -> Path | None:
+    """
+    Save a raw SearchAPI response body for debugging
+
+    Only writes when config.debug_dump_responses is set. Each call gets its own
+    file (name_<uuid>.json) and the write runs in a worker thread, off the loop.
+    """
+    if not config.debug_dump_responses:
+        return None
+    path = Path(f"{name}_{uuid.uuid4().hex}.json")
+    await asyncio.to_thread(_write_atomic, path, body)
+    return path
+
+
+def _write_atomic(path: Path, body: bytes) -> None:
+    """Write to a temp file and rename, so readers never see a partial dump"""
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_bytes(body)
+    os.replace(tmp, path)
+
+
+async def close_http_client():
+    """Close the shared HTTP client"""
+    global _http_client, _http_client_loop
+    if _http_client is not None:
+        if _on_current_loop(_http_client_loop):
+            await _http_client.aclose()
+        _http_client = None
+        _http_client_loop = None
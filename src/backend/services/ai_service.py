@@ -6,17 +6,20 @@ This module provides the core agent functionality using LangGraph.
 API routes should import and use the chat() function.
 """
 
-import os
+import time
+import asyncio
 import logging
-from typing import Literal
-from datetime import datetime, timedelta
-from dotenv import load_dotenv
+import httpx
+from typing import AsyncIterator, Iterable, Literal
+from contextvars import ContextVar
+from datetime import date, timedelta
+from functools import lru_cache
 
 from langchain_openai import ChatOpenAI
-from langchain_core.messages import HumanMessage
+from langchain_core.messages import HumanMessage, SystemMessage, ToolMessage
 from langchain_core.tools import tool
+from langchain_core.utils.function_calling import convert_to_openai_tool
 from langgraph.graph import StateGraph, MessagesState, START, END
-from langgraph.prebuilt import ToolNode
 
 # Configure logging
 logging.basicConfig(
@@ -28,31 +31,31 @@ logger = logging.getLogger(__name__)
 # Import our service functions
 try:
     # Try relative imports first (when used as package)
-    from .flight_service import get_flight_details, parse_flight_data_to_toon
-    from .hotel_service import get_hotel_details, parse_hotel_json
-    from .news_service import get_news, parse_news_data
+    from .flight_service import get_flight_details, parse_flight_data_to_toon, no_flights
+    from .hotel_service import get_hotel_details, parse_hotel_json, no_hotels
+    from .news_service import get_news, parse_news_data, no_news
     from .db_checkpointer import PostgresCheckpointer
+    from .cache import cached, FLIGHTS_TTL, HOTELS_TTL, NEWS_TTL
+    from .config import config
 except ImportError:
     # Fallback to absolute imports (when testing directly)
-    from flight_service import get_flight_details, parse_flight_data_to_toon
-    from hotel_service import get_hotel_details, parse_hotel_json
-    from news_service import get_news, parse_news_data
+    from flight_service import get_flight_details, parse_flight_data_to_toon, no_flights
+    from hotel_service import get_hotel_details, parse_hotel_json, no_hotels
+    from news_service import get_news, parse_news_data, no_news
     from db_checkpointer import PostgresCheckpointer
+    from cache import cached, FLIGHTS_TTL, HOTELS_TTL, NEWS_TTL
+    from config import config
 
-# Load environment variables
-load_dotenv()
 
-# Get current date for the system prompt
-def get_current_date_info() -> str:
-    """Get current date information for the AI to use"""
-    now = datetime.now()
-    return f"Today is {now.strftime('%A, %B %d, %Y')} (YYYY-MM-DD: {now.strftime('%Y-%m-%d')})"
+# Serve repeat searches from Redis (no-op when REDIS_URL is unset)
+get_flight_details = cached(FLIGHTS_TTL, "flights", is_empty=no_flights)(get_flight_details)
+get_hotel_details = cached(HOTELS_TTL, "hotels", is_empty=no_hotels)(get_hotel_details)
+get_news = cached(NEWS_TTL, "news", is_empty=no_news)(get_news)
 
 # System prompt for the travel agent
-SYSTEM_PROMPT = f"""You are a helpful travel planning assistant. Your role is to help users plan their trips by searching for flights, hotels, and travel news.
-
-**CURRENT DATE CONTEXT:**
-{get_current_date_info()}
+# Kept byte-for-byte constant (no dates interpolated) so OpenAI's prompt cache
+# can reuse it as the shared prefix of every request; get_current_date() supplies the date.
+SYSTEM_PROMPT = """You are a helpful travel planning assistant. Your role is to help users plan their trips by searching for flights, hotels, and travel news.
 
 CRITICAL: ALWAYS call get_current_date() FIRST when users mention ANY date, including:
 - Relative dates: "tomorrow", "next week", "18th"
@@ -63,6 +66,9 @@ You MUST determine if a date is in the past and use the correct future year.
 
 **CRITICAL INSTRUCTIONS FOR USING TOOLS:**
 
+When a request mentions multiple independent items (flights AND hotels AND news), emit all required tool calls in the same turn - they run in parallel.
+When users want flights AND a hotel for the same trip, call search_trip once - it runs both searches at the same time.
+
 When users mention RELATIVE DATES (tomorrow, next week, 18th, etc.):
 1. FIRST call get_current_date() to get today's date
 2. Calculate the actual date based on the context
@@ -141,45 +147,76 @@ User: "Hotels in Bali from tomorrow to next Friday"
 → Step 2: search_hotels(location="Bali", check_in_date="[tomorrow]", check_out_date="[next Friday]")
 """
 
+# One keep-alive connection pool for every OpenAI call made by the agent
+_openai_http_client = httpx.AsyncClient(
+    timeout=60.0,
+    limits=httpx.Limits(max_connections=100, max_keepalive_connections=50)
+)
+
+SYSTEM_MESSAGE = SystemMessage(content=SYSTEM_PROMPT)
+
 # Initialize LLM with GPT-4o-mini
 llm = ChatOpenAI(
     model="gpt-5-mini",
     temperature=0.2,
-    api_key=os.getenv("OPENAI_API_KEY")
+    api_key=config.openai_api_key,
+    http_async_client=_openai_http_client,
+    # Pin cache routing so turns from every user land on the cached system prompt
+    extra_body={"prompt_cache_key": "travel_agent_v1"}
 )
 
+
+async def close_openai_client():
+    """Close the shared OpenAI HTTP client"""
+    await _openai_http_client.aclose()
+
+def _new_request_data() -> dict:
+    return {
+        "flights": {},
+        "hotels": {},
+        "news": {}
+    }
+
+
 # Track data accessed in the current request only
-# No need for persistent storage since conversation history is in the database
-_current_request_data = {
-    "flights": {},
-    "hotels": {},
-    "news": {}
-}
+# No need for persistent storage since conversation history is in the database;
+# the UI receives this data in the chat response's data_store.
+# Each chat() call runs in its own context, so concurrent requests never share a store.
+_request_data_var: ContextVar[dict] = ContextVar("request_data")
+
+
+def _store_request_data(data_type: str, key: str, data: dict) -> None:
+    """Record full data for the current request"""
+    _request_data_var.get()[data_type][key] = data
 
 
 # ===== TOOL DEFINITIONS =====
 
-@tool
-def get_current_date() -> str:
-    """
-    Get the current date and time information. Use this when users mention dates or need date calculations.
+_MONTH_NAMES = (
+    "January", "February", "March", "April", "May", "June",
+    "July", "August", "September", "October", "November", "December"
+)
 
-    This tool helps you determine the CORRECT YEAR and date when users mention:
-    - Specific months without year (e.g., "January 15", "Dec 20")
-    - Relative dates (e.g., "tomorrow", "next week", "18th")
-    - Any date reference that needs context
 
-    IMPORTANT: Always assume future dates. If a month has already passed this year, use next year.
+# date.today() re-read at most once per second; the tool only needs day resolution
+_today_checked_at = float("-inf")
+_today_ordinal_value = 0
 
-    Returns:
-        String with current date, month information, and date calculation helpers
 
-    Examples:
-        Today is Nov 15, 2025. User says "January 15" → Should be 2026-01-15 (not 2025-01-15)
-        Today is Nov 15, 2025. User says "December 20" → Should be 2025-12-20 (still in future)
-        User says "18th" → Calculate which month's 18th based on current date
-    """
-    now = datetime.now()
+def _today_ordinal() -> int:
+    """Get date.today().toordinal(), refreshed at most once per second"""
+    global _today_checked_at, _today_ordinal_value
+    now = time.monotonic()
+    if now - _today_checked_at > 1.0:
+        _today_ordinal_value = date.today().toordinal()
+        _today_checked_at = now
+    return _today_ordinal_value
+
+
+@lru_cache(maxsize=2)
+def _build_date_info(ordinal: int) -> str:
+    """Build the get_current_date() text for a given day (date.toordinal())"""
+    now = date.fromordinal(ordinal)
     current_year = now.year
     current_month = now.month
     current_day = now.day
@@ -188,24 +225,14 @@ def get_current_date() -> str:
     tomorrow = now + timedelta(days=1)
     next_week = now + timedelta(days=7)
 
-    # For each month, determine the correct year to use
-    month_year_guide = []
-    months = [
-        "January", "February", "March", "April", "May", "June",
-        "July", "August", "September", "October", "November", "December"
-    ]
-
-    for month_num, month_name in enumerate(months, 1):
-        # If the month has already passed this year, use next year
-        if month_num < current_month:
-            year_to_use = current_year + 1
-            month_year_guide.append(f"{month_name} → {year_to_use}")
-        elif month_num == current_month:
-            # Same month - check if we've passed a specific day
-            month_year_guide.append(f"{month_name} → {current_year} (if day > {current_day}) or {current_year + 1} (if day <= {current_day})")
-        else:
-            year_to_use = current_year
-            month_year_guide.append(f"{month_name} → {year_to_use}")
+    # For each month, determine the correct year to use:
+    # passed months roll over to next year, the current month depends on the day
+    month_guide_str = "\n".join(
+        f"  - {month_name} → {current_year} (if day > {current_day}) or {current_year + 1} (if day <= {current_day})"
+        if month_num == current_month
+        else f"  - {month_name} → {current_year + (month_num < current_month)}"
+        for month_num, month_name in enumerate(_MONTH_NAMES, 1)
+    )
 
     # Calculate 18th of current or next month
     if current_day < 18:
@@ -219,8 +246,6 @@ def get_current_date() -> str:
             next_month_18 = now.replace(month=now.month + 1, day=18)
         eighteenth_str = f"18th of next month is {next_month_18.strftime('%Y-%m-%d')}"
 
-    month_guide_str = "\n".join([f"  - {guide}" for guide in month_year_guide[:12]])
-
     return f"""Current Date Information:
 - Today: {now.strftime('%A, %B %d, %Y')} ({now.strftime('%Y-%m-%d')})
 - Current month: {now.strftime('%B')} {current_year}
@@ -242,6 +267,30 @@ Examples:
 - Today is Nov 15, 2025. "October 5" → 2026-10-05 (Oct already passed)"""
 
 
+@tool
+def get_current_date() -> str:
+    """
+    Get the current date and time information. Use this when users mention dates or need date calculations.
+
+    This tool helps you determine the CORRECT YEAR and date when users mention:
+    - Specific months without year (e.g., "January 15", "Dec 20")
+    - Relative dates (e.g., "tomorrow", "next week", "18th")
+    - Any date reference that needs context
+
+    IMPORTANT: Always assume future dates. If a month has already passed this year, use next year.
+
+    Returns:
+        String with current date, month information, and date calculation helpers
+
+    Examples:
+        Today is Nov 15, 2025. User says "January 15" → Should be 2026-01-15 (not 2025-01-15)
+        Today is Nov 15, 2025. User says "December 20" → Should be 2025-12-20 (still in future)
+        User says "18th" → Calculate which month's 18th based on current date
+    """
+    # The text only changes when the date rolls over, so build it once per day
+    return _build_date_info(_today_ordinal())
+
+
 @tool
 async def search_flights(
     departure: str,
@@ -270,13 +319,14 @@ async def search_flights(
         search_flights("Mumbai", "Delhi", "2025-12-20")
         search_flights("New York", "London", "2025-01-15")
     """
-    logger.info("🛫 TOOL CALLED: search_flights")
-    logger.info("   Parameters:")
-    logger.info(f"      departure: {departure}")
-    logger.info(f"      arrival: {arrival}")
-    logger.info(f"      outbound_date: {outbound_date}")
-    logger.info(f"      is_round_trip: {is_round_trip}")
-    logger.info(f"      return_date: {return_date}")
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("🛫 TOOL CALLED: search_flights")
+        logger.info("   Parameters:")
+        logger.info("      departure: %s", departure)
+        logger.info("      arrival: %s", arrival)
+        logger.info("      outbound_date: %s", outbound_date)
+        logger.info("      is_round_trip: %s", is_round_trip)
+        logger.info("      return_date: %s", return_date)
 
     try:
         flight_data = await get_flight_details(
@@ -287,22 +337,27 @@ async def search_flights(
             return_date=return_date
         )
 
-        if not flight_data:
+        if not flight_data or no_flights(flight_data):
             logger.warning("   ⚠️ No flight data returned from API")
             return "No flights found for the given route and dates."
 
         toon, full_data = parse_flight_data_to_toon(flight_data)
 
-        logger.info("   ✅ Found flights, returning TOON format")
-        logger.info(f"   TOON preview: {toon[:200]}...")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("   ✅ Found flights, returning TOON format")
+            logger.info("   TOON preview: %s...", toon[:200])
 
         # Track this data for current request only
         request_key = f"{departure}_{arrival}_{outbound_date}"
-        _current_request_data["flights"][request_key] = full_data
+        _store_request_data("flights", request_key, full_data)
 
         return toon
     except Exception as e:
-        logger.error(f"   ❌ Error in search_flights: {str(e)}", exc_info=True)
+        # Tracebacks are costly to capture; only collect them when debugging
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.exception("   ❌ Error in search_flights: %s", e)
+        else:
+            logger.warning("   ❌ Error in search_flights: %s", e)
         return f"Error searching flights: {str(e)}"
 
 
@@ -338,14 +393,14 @@ async def search_hotels(
             q=location
         )
 
-        if not hotel_data:
+        if not hotel_data or no_hotels(hotel_data):
             return "No hotels found for the given location and dates."
 
         toon, full_data = parse_hotel_json(hotel_data)
 
         # Track this data for current request only
         request_key = f"{location}_{check_in_date}_{check_out_date}"
-        _current_request_data["hotels"][request_key] = full_data
+        _store_request_data("hotels", request_key, full_data)
 
         return toon
     except Exception as e:
@@ -371,22 +426,75 @@ async def search_news(query: str) -> str:
     try:
         news_data = await get_news(query)
 
-        if not news_data or not news_data.get('organic_results'):
+        # Looked up once here and handed to the parser (same test as no_news)
+        organic_results = news_data.get("organic_results") if news_data else None
+        if not organic_results:
             return "No news articles found for the given query."
 
-        toon, full_data = parse_news_data(news_data)
+        toon, full_data = parse_news_data(news_data, organic_results)
 
         # Track this data for current request only
-        _current_request_data["news"][query] = full_data
+        _store_request_data("news", query, full_data)
 
         return toon
     except Exception as e:
         return f"Error searching news: {str(e)}"
 
 
+@tool
+async def search_trip(
+    departure: str,
+    arrival: str,
+    outbound_date: str,
+    check_out_date: str,
+    return_date: str | None = None,
+    hotel_location: str | None = None
+) -> str:
+    """
+    Search flights and hotels for one trip at the same time.
+
+    IMPORTANT: Use CITY NAMES only (not airport codes). Dates must be in YYYY-MM-DD format.
+    The hotel check-in date is the outbound flight date.
+
+    Args:
+        departure: Departure CITY name (e.g., "Mumbai")
+        arrival: Destination CITY name (e.g., "Goa")
+        outbound_date: Flight date and hotel check-in date in YYYY-MM-DD format
+        check_out_date: Hotel check-out date in YYYY-MM-DD format
+        return_date: Return flight date in YYYY-MM-DD format (makes it a round trip)
+        hotel_location: Hotel location with optional description (default: the arrival city)
+
+    Returns:
+        The flight results followed by the hotel results, both in TOON format
+
+    Examples:
+        search_trip("Mumbai", "Goa", "2025-12-20", "2025-12-24", return_date="2025-12-24")
+        search_trip("Delhi", "Bali", "2025-11-17", "2025-11-20", hotel_location="beachside hotels in Bali")
+    """
+    # Both searches store their own results in this request's data store
+    flights, hotels = await asyncio.gather(
+        search_flights.ainvoke({
+            "departure": departure,
+            "arrival": arrival,
+            "outbound_date": outbound_date,
+            "is_round_trip": return_date is not None,
+            "return_date": return_date,
+        }),
+        search_hotels.ainvoke({
+            "check_in_date": outbound_date,
+            "check_out_date": check_out_date,
+            "location": hotel_location or arrival,
+        }),
+    )
+    return f"{flights}\n{hotels}"
+
+
 # Bind tools to LLM
-tools = [get_current_date, search_flights, search_hotels, search_news]
-llm_with_tools = llm.bind_tools(tools)
+tools = [get_current_date, search_flights, search_hotels, search_news, search_trip]
+tools_by_name = {t.name: t for t in tools}
+# The tool schemas are static: build the OpenAI payload once and ship it as-is every turn
+_TOOLS_JSON = [convert_to_openai_tool(t) for t in tools]
+llm_with_tools = llm.bind(tools=_TOOLS_JSON, parallel_tool_calls=True)
 
 
 # ===== GRAPH STATE =====
@@ -402,33 +510,59 @@ async def agent_node(state: AgentState) -> dict:
     """
     Main agent reasoning node - decides whether to call tools or respond
     """
+    # The system message is stored as the first message of every thread (see chat_stream)
     messages = state["messages"]
 
-    # Prepend system message if this is the first message
-    if len(messages) == 1:
-        messages = [{"role": "system", "content": SYSTEM_PROMPT}] + messages
-
-    logger.info("=" * 80)
-    logger.info("🤖 AGENT NODE: Invoking LLM to decide next action")
-    logger.info(f"   Messages in context: {len(messages)}")
+    logger.info("🤖 AGENT NODE: Invoking LLM with %d message(s)", len(messages))
 
     response = await llm_with_tools.ainvoke(messages)
 
     # Log what the agent decided to do
     if hasattr(response, "tool_calls") and response.tool_calls:
-        logger.info(f"   ✅ Agent decided to call {len(response.tool_calls)} tool(s)")
-        for i, tool_call in enumerate(response.tool_calls, 1):
-            logger.info(f"   📞 Tool Call #{i}:")
-            logger.info(f"      Tool: {tool_call.get('name', 'unknown')}")
-            logger.info(f"      Arguments: {tool_call.get('args', {})}")
+        logger.info("   ✅ Agent decided to call %d tool(s)", len(response.tool_calls))
+        if logger.isEnabledFor(logging.DEBUG):
+            for i, tool_call in enumerate(response.tool_calls, 1):
+                logger.debug("   📞 Tool Call #%d: %s %s", i, tool_call.get('name', 'unknown'), tool_call.get('args', {}))
     else:
         logger.info("   💬 Agent decided to respond directly (no tool calls)")
-        logger.info(f"   Response preview: {response.content[:100]}...")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("   Response preview: %s...", response.content[:100])
 
-    logger.info("=" * 80)
     return {"messages": [response]}
 
 
+async def _invoke_tool(tool_call: dict) -> str:
+    """Run a single tool call, raising for tools the agent doesn't know about"""
+    selected_tool = tools_by_name.get(tool_call["name"])
+    if selected_tool is None:
+        raise ValueError(f"Unknown tool: {tool_call['name']}")
+    return await selected_tool.ainvoke(tool_call["args"])
+
+
+async def tool_node(state: AgentState) -> dict:
+    """
+    Tool execution node - runs every tool call from the last message concurrently
+
+    Results come back as ToolMessages in the same order as the tool calls.
+    """
+    tool_calls = state["messages"][-1].tool_calls
+
+    logger.info("🔧 TOOL NODE: Running %d tool call(s) concurrently", len(tool_calls))
+    results = await asyncio.gather(
+        *(_invoke_tool(tool_call) for tool_call in tool_calls),
+        return_exceptions=True
+    )
+
+    messages = []
+    for tool_call, result in zip(tool_calls, results):
+        if isinstance(result, Exception):
+            logger.error("   ❌ Tool %s failed: %s", tool_call['name'], result)
+            result = f"Error running {tool_call['name']}: {str(result)}"
+        messages.append(ToolMessage(content=result, tool_call_id=tool_call["id"], name=tool_call["name"]))
+
+    return {"messages": messages}
+
+
 def should_continue(state: AgentState) -> Literal["tools", "end"]:
     """
     Router function - determines if we should call tools or end
@@ -457,7 +591,7 @@ def create_agent_graph():
 
     # Add nodes
     workflow.add_node("agent", agent_node)
-    workflow.add_node("tools", ToolNode(tools))
+    workflow.add_node("tools", tool_node)
 
     # Add edges
     workflow.add_edge(START, "agent")
@@ -483,81 +617,130 @@ def create_agent_graph():
 agent = create_agent_graph()
 
 
-async def chat(user_message: str, thread_id: str = "default") -> dict:
+async def start_checkpoint_writer():
+    """Start batching the agent's checkpoint writes (call once the event loop is running)"""
+    await agent.checkpointer.start_batch_writer()
+
+
+async def close_checkpoint_writer():
+    """Flush any queued checkpoints before shutdown"""
+    await agent.checkpointer.drain_on_shutdown()
+
+
+def _without_known(request_data: dict, known_keys: dict[str, Iterable[str]] | None) -> dict:
+    """Drop entries the client already holds from an earlier turn"""
+    if not known_keys:
+        return request_data
+    delta = {}
+    for data_type, entries in request_data.items():
+        known = known_keys.get(data_type)
+        if known:
+            known = set(known)
+            entries = {key: value for key, value in entries.items() if key not in known}
+        delta[data_type] = entries
+    return delta
+
+
+async def chat_stream(
+    user_message: str,
+    thread_id: str = "default",
+    known_keys: dict[str, Iterable[str]] | None = None
+) -> AsyncIterator[dict]:
     """
-    Main chat interface for the travel planning agent
+    Streaming chat interface for the travel planning agent
 
     Args:
         user_message: User's query/message
         thread_id: Conversation thread ID for maintaining context
+        known_keys: data_store keys the client already has, per data type; omitted from "done"
 
-    Returns:
-        dict with 'response' (agent's message) and 'data_store' (only data accessed in this request)
+    Yields:
+        {"type": "token", "content": str} for each LLM token as it arrives
+        {"type": "tool_end", "name": str} whenever a tool finishes
+        {"type": "done", "response", "tool_calls", "data_store"} once, after the agent finishes
     """
-    global _current_request_data
-    
-    # Reset current request data at the start of each request
-    _current_request_data = {
-        "flights": {},
-        "hotels": {},
-        "news": {}
-    }
-    
-    config = {"configurable": {"thread_id": thread_id}}
-
-    # Invoke the agent
-    result = await agent.ainvoke(
-        {"messages": [HumanMessage(content=user_message)]},
-        config=config
-    )
-
-    # Extract the final response
-    final_message = result["messages"][-1]
-
-    response = {
-        "response": final_message.content,
-        "tool_calls": [],
-        "data_store": _current_request_data  # Return only data accessed in this request
-    }
-
-    return response
+    # Give this request its own data store for the duration of the agent run
+    request_data = _new_request_data()
+    token = _request_data_var.set(request_data)
+    try:
+        config = {"configurable": {"thread_id": thread_id}}
+
+        # Seed new threads with the system prompt once; it then persists in the checkpoint
+        messages = [HumanMessage(content=user_message)]
+        state = await agent.aget_state(config)
+        if not (state.values and state.values.get("messages")):
+            messages.insert(0, SYSTEM_MESSAGE)
+
+        final_state = None
+        async for event in agent.astream_events(
+            {"messages": messages},
+            config=config,
+            version="v2"
+        ):
+            kind = event["event"]
+            if kind == "on_chat_model_stream":
+                content = event["data"]["chunk"].content
+                if content:
+                    yield {"type": "token", "content": content}
+            elif kind == "on_tool_end":
+                yield {"type": "tool_end", "name": event["name"]}
+            elif kind == "on_chain_end" and not event.get("parent_ids"):
+                # The graph run itself has no parent; its output is the final state
+                final_state = event["data"]["output"]
+
+        if final_state is None:
+            # No root on_chain_end event arrived; read the run's result from the checkpoint
+            final_state = (await agent.aget_state(config)).values
+        if not final_state or not final_state.get("messages"):
+            raise RuntimeError(f"Agent run for thread {thread_id!r} finished without a final state")
+
+        # Extract the final response
+        final_message = final_state["messages"][-1]
+
+        yield {
+            "type": "done",
+            "response": final_message.content,
+            "tool_calls": [],
+            "data_store": _without_known(request_data, known_keys)  # Only new data from this request
+        }
+    finally:
+        # Restore the caller's context once the stream is done (or abandoned)
+        _request_data_var.reset(token)
 
 
-def get_stored_data(data_type: str, key: str) -> dict:
+async def chat(
+    user_message: str,
+    thread_id: str = "default",
+    known_keys: dict[str, Iterable[str]] | None = None
+) -> dict:
     """
-    Retrieve full data for a specific search from the current request
-    
-    Note: This only returns data from the current request.
-    Historical data is stored in the conversation database.
+    Main chat interface for the travel planning agent
+
+    Collects chat_stream() for callers that want the whole reply at once.
 
     Args:
-        data_type: One of "flights", "hotels", "news"
-        key: The request key used when storing
+        user_message: User's query/message
+        thread_id: Conversation thread ID for maintaining context
+        known_keys: data_store keys the client already has, per data type
 
     Returns:
-        Full data dict with all details for UI display, or empty dict if not found
+        dict with 'response' (agent's message) and 'data_store' (only data accessed in this request)
     """
-    return _current_request_data.get(data_type, {}).get(key, {})
-
+    response = {}
+    async for event in chat_stream(user_message, thread_id, known_keys):
+        if event["type"] == "done":
+            response = {
+                "response": event["response"],
+                "tool_calls": event["tool_calls"],
+                "data_store": event["data_store"]
+            }
 
-def clear_data_store():
-    """
-    Clear current request data
-    
-    Note: This only clears the current request's data.
-    Conversation history in the database is not affected.
-    """
-    global _current_request_data
-    _current_request_data = {
-        "flights": {},
-        "hotels": {},
-        "news": {}
-    }
+    return response
 
 
 # ===== HELPER FUNCTIONS =====
 
-def get_conversation_history(thread_id: str) -> list:
+async def get_conversation_history(thread_id: str) -> list:
     """
     Get conversation history for a specific thread
 
@@ -568,5 +751,7 @@ def get_conversation_history(thread_id: str) -> list:
         List of messages in the conversation
     """
     config = {"configurable": {"thread_id": thread_id}}
-    state = agent.get_state(config)
-    return state.values.get("messages", []) if state.values else []
+    state = await agent.aget_state(config)
+    messages = state.values.get("messages", []) if state.values else []
+    # The stored system prompt is internal, not part of the visible conversation
+    return [msg for msg in messages if getattr(msg, "type", None) != "system"]
@@ -0,0 +1,31 @@
+"""
+Build the pickled city → IATA/ICAO index used by flight_service
+
+IATA.json ships with the repo and never changes at runtime, so the index
+is materialized once at build time instead of on every process start.
+Only iata is imported, so no API keys are needed to run it.
+
+Run from anywhere, e.g. from src/backend:
+    python services/build_iata_cache.py
+"""
+
+import pickle
+from pathlib import Path
+
+try:
+    from .iata import IATA_INDEX_PATH, _build_city_index, get_data_json
+except ImportError:
+    from iata import IATA_INDEX_PATH, _build_city_index, get_data_json
+
+
+def build_iata_cache(path: Path = IATA_INDEX_PATH) -> int:
+    """Write the city index to disk and return the number of cities"""
+    index = _build_city_index(get_data_json())
+    with open(path, "wb") as f:
+        pickle.dump(index, f, protocol=5)
+    return len(index)
+
+
+if __name__ == "__main__":
+    count = build_iata_cache()
+    print(f"✅ Wrote {count} cities to {IATA_INDEX_PATH}")
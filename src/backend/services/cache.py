@@ -0,0 +1,155 @@
+"""
+Redis read-through cache for SearchAPI.io responses
+
+Wrap a service coroutine with cached(ttl, namespace) to serve repeat
+searches from Redis. Caching is skipped entirely when REDIS_URL is not
+set, and Redis errors fall back to calling the wrapped function.
+Concurrent identical calls are coalesced onto one upstream request.
+
+TTLCache is the small bounded in-process cache the services keep in front
+of SearchAPI.io (and of Redis, when it is configured).
+"""
+
+import asyncio
+import hashlib
+import logging
+import time
+from functools import wraps
+
+import orjson
+import redis.asyncio as redis
+
+try:
+    from .config import config
+    from ._http import coalesce
+except ImportError:
+    from config import config
+    from _http import coalesce
+
+logger = logging.getLogger(__name__)
+
+# Content-aware TTLs (seconds): fares move faster than hotel rates, news fastest
+FLIGHTS_TTL = 60 * 60
+HOTELS_TTL = 6 * 60 * 60
+NEWS_TTL = 15 * 60
+# Empty results are cached briefly so a route with no availability now isn't pinned for hours
+EMPTY_TTL = 60
+
+# One client (and connection pool) shared by every cached function
+_redis_client = None
+
+# Calls currently running, keyed like the cache, so duplicates can await them
+_inflight: dict[str, asyncio.Future] = {}
+
+
+def get_redis_client() -> redis.Redis | None:
+    """Get or create the shared Redis client, or None if Redis isn't configured"""
+    global _redis_client
+    if _redis_client is None and config.redis_url:
+        _redis_client = redis.from_url(config.redis_url)
+    return _redis_client
+
+
+async def close_redis_client():
+    """Close the shared Redis client"""
+    global _redis_client
+    if _redis_client is not None:
+        await _redis_client.aclose()
+        _redis_client = None
+
+
+class TTLCache:
+    """
+    In-process cache holding at most maxsize entries, each with its own ttl
+
+    Expired entries are kept (peek still returns them) until space is
+    needed: a full cache first drops expired entries, then the oldest.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        # key -> (expires_at, value); dicts keep insertion order, so the first key is the oldest
+        self._entries: dict = {}
+
+    def get(self, key):
+        """The value for key, or None if it is missing or expired"""
+        entry = self._entries.get(key)
+        if entry and time.monotonic() < entry[0]:
+            return entry[1]
+        return None
+
+    def peek(self, key):
+        """The value for key even if it has expired, or None if it is missing"""
+        entry = self._entries.get(key)
+        return entry[1] if entry else None
+
+    def expires_at(self, key) -> float:
+        """The time.monotonic() deadline of key's entry"""
+        return self._entries[key][0]
+
+    def set(self, key, value, ttl: float):
+        now = time.monotonic()
+        self._entries.pop(key, None)
+        if len(self._entries) >= self.maxsize:
+            for expired in [k for k, (expires_at, _) in self._entries.items() if expires_at <= now]:
+                del self._entries[expired]
+            if len(self._entries) >= self.maxsize:
+                self._entries.pop(next(iter(self._entries)))
+        self._entries[key] = (now + ttl, value)
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __iter__(self):
+        return iter(self._entries)
+
+
+def _make_key(namespace: str, args: tuple, kwargs: dict) -> str:
+    payload = orjson.dumps([args, kwargs], option=orjson.OPT_SORT_KEYS)
+    return f"{namespace}:{hashlib.blake2b(payload, digest_size=16).hexdigest()}"
+
+
+def cached(ttl: int, namespace: str, is_empty=None):
+    """
+    Cache the (truthy) results of an async function in Redis for ttl seconds
+
+    Results for which is_empty(result) is true are only kept for EMPTY_TTL.
+
+    Identical calls that arrive while one is already running await that call's
+    result instead of issuing their own, whether or not Redis is configured.
+    """
+    def decorator(func):
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            key = _make_key(namespace, args, kwargs)
+
+            client = get_redis_client()
+            if client is not None:
+                try:
+                    hit = await client.get(key)
+                    if hit is not None:
+                        logger.info("♻️ Cache hit: %s", namespace)
+                        return orjson.loads(hit)
+                except redis.RedisError as e:
+                    logger.warning("⚠️ Redis get failed for %s: %s", namespace, e)
+
+            # Singleflight: piggyback on an identical call that's already in flight;
+            # only the call that ran func writes the result back to Redis
+            if key in _inflight:
+                logger.info("⏳ Joining in-flight call: %s", namespace)
+                return await coalesce(_inflight, key, lambda: func(*args, **kwargs))
+            result = await coalesce(_inflight, key, lambda: func(*args, **kwargs))
+
+            # Never cache failures (None / empty dict)
+            if result and client is not None:
+                try:
+                    expiry = EMPTY_TTL if is_empty is not None and is_empty(result) else ttl
+                    await client.set(key, orjson.dumps(result), ex=expiry)
+                except redis.RedisError as e:
+                    logger.warning("⚠️ Redis set failed for %s: %s", namespace, e)
+            return result
+        return wrapper
+    return decorator
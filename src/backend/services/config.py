@@ -1,17 +1,23 @@
 # config.py
-import os
-from pydantic_settings import BaseSettings
-from dotenv import load_dotenv
-
-load_dotenv(override=True)
+from types import MappingProxyType
+from typing import Any, Mapping
+from pydantic import Field, field_validator
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
 class Config(BaseSettings):
-    serp_key: str = os.getenv("SEARCH_API_KEY")
+    # Read straight from the environment / .env once by pydantic-settings
+    model_config = SettingsConfigDict(env_file=".env", extra="ignore")
+
+    serp_key: str = Field(validation_alias="SEARCH_API_KEY")
+    openai_api_key: str
     base_api_url: str = "https://www.searchapi.io/api/v1/search"
+    redis_url: str | None = None  # Response cache is disabled when unset
+    serp_concurrency: int = 8  # Max in-flight SearchAPI requests, kept under the per-key rate limit
+    debug_dump_responses: bool = False  # Save raw SearchAPI responses to disk (debugging only)
 
     # Default parameters for Google Flights API
-    default_flight_params: dict = {
+    default_flight_params: Mapping[str, Any] = {
         "engine": "google_flights",     # Required
         "travel_class": "economy",      # economy | premium_economy | business | first_class
         "flight_type": "one_way",       # default, overridden for round_trip
@@ -26,7 +32,7 @@ class Config(BaseSettings):
         "infants_in_seat": 0,
     }
 
-    default_hotel_params: dict = {
+    default_hotel_params: Mapping[str, Any] = {
         "engine": "google_hotels",
         "q" : "",
 
@@ -40,7 +46,7 @@ class Config(BaseSettings):
         "currency": "INR",
     }
 
-    default_news_params: dict = {
+    default_news_params: Mapping[str, Any] = {
         "engine": "google_news",
         "q": "",
         
@@ -50,6 +56,11 @@ class Config(BaseSettings):
 
     }
 
-    
+    @field_validator("default_flight_params", "default_hotel_params", "default_news_params")
+    @classmethod
+    def _freeze_params(cls, value: Mapping[str, Any]) -> Mapping[str, Any]:
+        """Expose defaults as read-only views so callers layer overrides instead of copying"""
+        return MappingProxyType(dict(value))
+
 
 config = Config()
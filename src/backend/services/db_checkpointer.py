@@ -5,32 +5,163 @@ This module provides a custom checkpointer that stores LangGraph state
 in PostgreSQL instead of in-memory, enabling persistent chat history.
 """
 
-import json
+import asyncio
 import logging
-from typing import Optional, Any, Iterator
-from datetime import datetime
-from contextlib import contextmanager
+from typing import Optional, Any, AsyncIterator, Iterator
+from datetime import datetime, timezone
+from collections import OrderedDict
+from contextlib import asynccontextmanager, contextmanager
 
+import msgpack
+import xxhash
+
+from langchain_core.messages import HumanMessage, AIMessage, SystemMessage, ToolMessage
 from langgraph.checkpoint.base import BaseCheckpointSaver, Checkpoint, CheckpointMetadata, CheckpointTuple
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import select
+from sqlalchemy import bindparam, insert, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
-from db.base import SessionLocal
+from db.base import SessionLocal, async_session_maker
 from db.models import Conversation, Checkpoint as CheckpointModel
 
 logger = logging.getLogger(__name__)
 
+# Serialized messages kept per checkpointer; a thread's history is re-saved every step
+MESSAGE_CACHE_SIZE = 256
+
+# Background batch writer: rows per INSERT, max wait before flushing, queue bound
+BATCH_MAX_ROWS = 100
+BATCH_FLUSH_INTERVAL = 0.05
+BATCH_QUEUE_SIZE = 1000
+# A failed batch is retried with exponential backoff before falling back to per-row writes
+BATCH_WRITE_ATTEMPTS = 3
+BATCH_RETRY_DELAY = 0.1  # seconds, doubled after each failed attempt
+
+# Threads whose last saved channel-values hash is remembered (least recently saved evicted)
+LAST_HASH_CACHE_SIZE = 10_000
+
+# Channel values of these types are stored as-is without a serializability probe
+_JSON_SCALARS = (str, int, float, bool, type(None))
+
+
+# ---------- Prebuilt statements: only parameters are bound per call ----------
+# Creates the conversation in one round-trip; RETURNING yields a row only when it was new
+_ENSURE_CONVERSATION_STMT = (
+    pg_insert(Conversation)
+    .values(thread_id=bindparam("thread_id"))
+    .on_conflict_do_nothing(index_elements=["thread_id"])
+    .returning(Conversation.id)
+)
+
+_LATEST_CHECKPOINT_STMT = (
+    select(CheckpointModel)
+    .where(CheckpointModel.thread_id == bindparam("thread_id"))
+    .order_by(CheckpointModel.created_at.desc())
+    .limit(1)
+)
+
+# Columns returned by list_metadata(): everything except the checkpoint blob
+_METADATA_COLUMNS = (
+    CheckpointModel.checkpoint_id,
+    CheckpointModel.parent_checkpoint_id,
+    CheckpointModel.checkpoint_metadata,
+    CheckpointModel.created_at,
+)
+
+
+def _build_list_stmt(stmt, paged: bool):
+    """Newest-first page of a thread's checkpoints, optionally older than checkpoint :before"""
+    stmt = (
+        stmt.where(CheckpointModel.thread_id == bindparam("thread_id"))
+        .order_by(CheckpointModel.created_at.desc())
+        .limit(bindparam("limit"))
+    )
+    if paged:
+        before_created = (
+            select(CheckpointModel.created_at)
+            .where(CheckpointModel.thread_id == bindparam("thread_id"), CheckpointModel.checkpoint_id == bindparam("before"))
+            .limit(1)
+            .scalar_subquery()
+        )
+        stmt = stmt.where(CheckpointModel.created_at < before_created)
+    return stmt
+
+
+# (metadata_only, paged) -> statement
+_LIST_STMTS = {
+    (metadata_only, paged): _build_list_stmt(select(*_METADATA_COLUMNS) if metadata_only else select(CheckpointModel), paged)
+    for metadata_only in (False, True)
+    for paged in (False, True)
+}
+
+
+# ---------- Message reconstruction, dispatched on the stored "type" ----------
+def _build_human(msg_data: dict) -> HumanMessage:
+    return HumanMessage(content=msg_data.get("content", ""))
+
+
+def _build_ai(msg_data: dict) -> AIMessage:
+    # One constructor call instead of building the message and then re-assigning fields
+    return AIMessage(
+        content=msg_data.get("content", ""),
+        additional_kwargs=msg_data.get("additional_kwargs", {}),
+        tool_calls=msg_data.get("tool_calls", [])
+    )
+
+
+def _build_system(msg_data: dict) -> SystemMessage:
+    return SystemMessage(content=msg_data.get("content", ""))
+
+
+def _build_tool(msg_data: dict) -> ToolMessage:
+    return ToolMessage(
+        content=msg_data.get("content", ""),
+        tool_call_id=msg_data.get("tool_call_id", ""),
+        name=msg_data.get("name")
+    )
+
+
+_MESSAGE_BUILDERS = {
+    "human": _build_human,
+    "ai": _build_ai,
+    "system": _build_system,
+    "tool": _build_tool,
+}
+
+
+class CheckpointWriteError(RuntimeError):
+    """A queued checkpoint could not be saved after retries"""
+
+
+def _list_params(thread_id: str, limit: int, before: Optional[str]) -> dict:
+    """Bind parameters for the _LIST_STMTS statements"""
+    return {"thread_id": thread_id, "limit": limit, "before": before}
+
 
 class PostgresCheckpointer(BaseCheckpointSaver):
     """
     PostgreSQL-backed checkpointer for LangGraph.
     
     Stores conversation state in PostgreSQL for persistence across restarts.
+    The async methods used by the agent run on the pooled asyncpg engine;
+    the sync methods keep working on the psycopg2 engine.
     """
 
     def __init__(self):
         """Initialize the PostgreSQL checkpointer"""
         super().__init__()
+        # message id -> (message object, serialized dict), least recently used first
+        self._message_cache: OrderedDict[str, tuple[Any, dict]] = OrderedDict()
+        # Batch writer state; aput writes directly until start_batch_writer() runs
+        self._queue: Optional[asyncio.Queue] = None
+        self._writer_task: Optional[asyncio.Task] = None
+        # thread_id -> (row, channel-values hash) of the newest row still queued, so reads see it
+        self._pending: dict[str, tuple[dict, int]] = {}
+        # thread_id -> why a queued checkpoint was lost; raised by that thread's next aput
+        self._write_errors: dict[str, Exception] = {}
+        # thread_id -> hash of the channel values last written, to skip identical re-saves
+        self._last_hash: OrderedDict[str, int] = OrderedDict()
         logger.info("✅ PostgresCheckpointer initialized")
 
     @contextmanager
@@ -42,22 +173,128 @@ class PostgresCheckpointer(BaseCheckpointSaver):
             session.commit()
         except Exception as e:
             session.rollback()
-            logger.error(f"Database error in checkpointer: {e}")
+            logger.error("Database error in checkpointer: %s", e)
             raise
         finally:
             session.close()
 
+    @asynccontextmanager
+    async def _get_async_session(self) -> AsyncIterator[AsyncSession]:
+        """Get a pooled async database session with automatic cleanup"""
+        async with async_session_maker() as session:
+            try:
+                yield session
+                await session.commit()
+            except Exception as e:
+                await session.rollback()
+                logger.error("Database error in checkpointer: %s", e)
+                raise
+
     def _ensure_conversation_exists(self, session: Session, thread_id: str) -> None:
         """Ensure a conversation record exists for the thread"""
-        conversation = session.execute(
-            select(Conversation).where(Conversation.thread_id == thread_id)
+        created = session.execute(
+            _ENSURE_CONVERSATION_STMT, {"thread_id": thread_id}
         ).scalar_one_or_none()
 
-        if not conversation:
-            conversation = Conversation(thread_id=thread_id)
-            session.add(conversation)
-            session.flush()
-            logger.info(f"📝 Created new conversation: {thread_id}")
+        if created is not None:
+            logger.info("📝 Created new conversation: %s", thread_id)
+
+    async def _aensure_conversation_exists(self, session: AsyncSession, thread_id: str) -> None:
+        """Async version of _ensure_conversation_exists"""
+        created = (await session.execute(
+            _ENSURE_CONVERSATION_STMT, {"thread_id": thread_id}
+        )).scalar_one_or_none()
+
+        if created is not None:
+            logger.info("📝 Created new conversation: %s", thread_id)
+
+    def _build_row(self, thread_id: str, checkpoint: Checkpoint, metadata: CheckpointMetadata) -> dict:
+        """Build the checkpoint row values for a LangGraph checkpoint"""
+        # Serialize checkpoint data
+        checkpoint_data = {
+            "v": checkpoint.get("v", 1),
+            "ts": checkpoint.get("ts"),
+            "id": checkpoint.get("id"),
+            "channel_values": self._serialize_channel_values(checkpoint.get("channel_values", {})),
+            "channel_versions": checkpoint.get("channel_versions", {}),
+            "versions_seen": checkpoint.get("versions_seen", {}),
+        }
+
+        # Serialize metadata
+        metadata_json = {
+            "source": metadata.get("source", "input"),
+            "step": metadata.get("step", -1),
+            "writes": metadata.get("writes"),
+        }
+
+        return {
+            "thread_id": thread_id,
+            "checkpoint_id": checkpoint.get("id", ""),
+            "parent_checkpoint_id": checkpoint.get("parent_id"),
+            "checkpoint_data": checkpoint_data,
+            "checkpoint_metadata": metadata_json,
+            # Stamped here rather than by the server, so rows batched into one
+            # transaction still order correctly
+            "created_at": datetime.now(timezone.utc),
+        }
+
+    def _channel_digest(self, row: dict) -> int:
+        """Hash of the row's channel values"""
+        packed = msgpack.packb(row["checkpoint_data"]["channel_values"], use_bin_type=True)
+        return xxhash.xxh3_64_intdigest(packed)
+
+    def _is_duplicate(self, thread_id: str, digest: int) -> bool:
+        """True when the channel values match the thread's queued or last written ones"""
+        pending = self._pending.get(thread_id)
+        last = pending[1] if pending is not None else self._last_hash.get(thread_id)
+        if last == digest:
+            logger.debug("⏭️ Skipped unchanged checkpoint for thread: %s", thread_id)
+            return True
+        return False
+
+    def _record_saved(self, thread_id: str, digest: int) -> None:
+        """Remember a confirmed write; only then may identical re-saves be skipped"""
+        self._last_hash[thread_id] = digest
+        self._last_hash.move_to_end(thread_id)
+        if len(self._last_hash) > LAST_HASH_CACHE_SIZE:
+            self._last_hash.popitem(last=False)
+
+    def _record_to_checkpoint(self, checkpoint_record: CheckpointModel) -> Checkpoint:
+        """Rebuild a LangGraph checkpoint from its row"""
+        # MsgPack columns come back already decoded
+        return self._data_to_checkpoint(checkpoint_record.checkpoint_data)
+
+    def _data_to_checkpoint(self, checkpoint_data: dict) -> Checkpoint:
+        """Rebuild a LangGraph checkpoint from stored checkpoint data"""
+        return {
+            "v": checkpoint_data.get("v", 1),
+            "ts": checkpoint_data.get("ts"),
+            "id": checkpoint_data.get("id"),
+            "channel_values": self._deserialize_channel_values(checkpoint_data.get("channel_values", {})),
+            "channel_versions": checkpoint_data.get("channel_versions", {}),
+            "versions_seen": checkpoint_data.get("versions_seen", {}),
+        }
+
+    def _to_tuple(self, config: dict, checkpoint: Optional[Checkpoint]) -> Optional[CheckpointTuple]:
+        """Wrap a checkpoint in the CheckpointTuple LangGraph expects"""
+        if checkpoint is None:
+            return None
+
+        # Create metadata dict
+        metadata = {
+            "source": "input",
+            "step": -1,
+            "writes": None,
+        }
+
+        # Return CheckpointTuple named tuple
+        return CheckpointTuple(
+            config=config,
+            checkpoint=checkpoint,
+            metadata=metadata,
+            parent_config=None,
+            pending_writes=[]
+        )
 
     def put(
         self,
@@ -77,45 +314,25 @@ class PostgresCheckpointer(BaseCheckpointSaver):
             Updated config dict
         """
         thread_id = config.get("configurable", {}).get("thread_id", "default")
+        row = self._build_row(thread_id, checkpoint, metadata)
+        digest = self._channel_digest(row)
+        if self._is_duplicate(thread_id, digest):
+            return config
         
         try:
             with self._get_session() as session:
                 # Ensure conversation exists
                 self._ensure_conversation_exists(session, thread_id)
 
-                # Serialize checkpoint data
-                checkpoint_data = json.dumps({
-                    "v": checkpoint.get("v", 1),
-                    "ts": checkpoint.get("ts"),
-                    "id": checkpoint.get("id"),
-                    "channel_values": self._serialize_channel_values(checkpoint.get("channel_values", {})),
-                    "channel_versions": checkpoint.get("channel_versions", {}),
-                    "versions_seen": checkpoint.get("versions_seen", {}),
-                })
-
-                # Serialize metadata
-                metadata_json = json.dumps({
-                    "source": metadata.get("source", "input"),
-                    "step": metadata.get("step", -1),
-                    "writes": metadata.get("writes"),
-                })
-
-                # Create checkpoint record
-                checkpoint_record = CheckpointModel(
-                    thread_id=thread_id,
-                    checkpoint_id=checkpoint.get("id", ""),
-                    parent_checkpoint_id=checkpoint.get("parent_id"),
-                    checkpoint_data=checkpoint_data,
-                    checkpoint_metadata=metadata_json,
-                )
-
-                session.add(checkpoint_record)
+                session.add(CheckpointModel(**row))
                 session.flush()
 
-                logger.info(f"💾 Saved checkpoint for thread: {thread_id}")
+                logger.debug("💾 Saved checkpoint for thread: %s", thread_id)
+            # Recorded once the session has committed
+            self._record_saved(thread_id, digest)
 
         except Exception as e:
-            logger.error(f"❌ Error saving checkpoint: {e}")
+            logger.error("❌ Error saving checkpoint: %s", e)
             raise
 
         return config
@@ -132,37 +349,28 @@ class PostgresCheckpointer(BaseCheckpointSaver):
         """
         thread_id = config.get("configurable", {}).get("thread_id", "default")
 
+        pending = self._pending.get(thread_id)
+        if pending is not None:
+            return self._data_to_checkpoint(pending[0]["checkpoint_data"])
+
         try:
             with self._get_session() as session:
                 # Get the latest checkpoint for this thread
                 checkpoint_record = session.execute(
-                    select(CheckpointModel)
-                    .where(CheckpointModel.thread_id == thread_id)
-                    .order_by(CheckpointModel.created_at.desc())
-                    .limit(1)
+                    _LATEST_CHECKPOINT_STMT, {"thread_id": thread_id}
                 ).scalar_one_or_none()
 
                 if not checkpoint_record:
-                    logger.info(f"📭 No checkpoint found for thread: {thread_id}")
+                    logger.debug("📭 No checkpoint found for thread: %s", thread_id)
                     return None
 
-                # Deserialize checkpoint data
-                checkpoint_data = json.loads(checkpoint_record.checkpoint_data)
-                
-                checkpoint = {
-                    "v": checkpoint_data.get("v", 1),
-                    "ts": checkpoint_data.get("ts"),
-                    "id": checkpoint_data.get("id"),
-                    "channel_values": self._deserialize_channel_values(checkpoint_data.get("channel_values", {})),
-                    "channel_versions": checkpoint_data.get("channel_versions", {}),
-                    "versions_seen": checkpoint_data.get("versions_seen", {}),
-                }
-
-                logger.info(f"📬 Retrieved checkpoint for thread: {thread_id}")
+                checkpoint = self._record_to_checkpoint(checkpoint_record)
+
+                logger.debug("📬 Retrieved checkpoint for thread: %s", thread_id)
                 return checkpoint
 
         except Exception as e:
-            logger.error(f"❌ Error retrieving checkpoint: {e}")
+            logger.error("❌ Error retrieving checkpoint: %s", e)
             return None
 
     def get_tuple(self, config: dict):
@@ -171,31 +379,36 @@ class PostgresCheckpointer(BaseCheckpointSaver):
         Sync version required by LangGraph.
         Returns a CheckpointTuple named tuple.
         """
-        checkpoint = self.get(config)
-        if checkpoint is None:
-            return None
-        
-        # Create metadata dict
-        metadata = {
-            "source": "input",
-            "step": -1,
-            "writes": None,
-        }
-        parent_config = None
-        pending_writes = []
-        
-        # Return CheckpointTuple named tuple
-        return CheckpointTuple(
-            config=config,
-            checkpoint=checkpoint,
-            metadata=metadata,
-            parent_config=parent_config,
-            pending_writes=pending_writes
-        )
+        return self._to_tuple(config, self.get(config))
 
     async def aget(self, config: dict) -> Optional[Checkpoint]:
-        """Async version of get - delegates to sync version"""
-        return self.get(config)
+        """Async version of get, on the pooled async engine"""
+        thread_id = config.get("configurable", {}).get("thread_id", "default")
+
+        # A checkpoint still queued for writing is newer than anything in the table
+        pending = self._pending.get(thread_id)
+        if pending is not None:
+            return self._data_to_checkpoint(pending[0]["checkpoint_data"])
+
+        try:
+            async with self._get_async_session() as session:
+                # Get the latest checkpoint for this thread
+                checkpoint_record = (await session.execute(
+                    _LATEST_CHECKPOINT_STMT, {"thread_id": thread_id}
+                )).scalar_one_or_none()
+
+                if not checkpoint_record:
+                    logger.debug("📭 No checkpoint found for thread: %s", thread_id)
+                    return None
+
+                checkpoint = self._record_to_checkpoint(checkpoint_record)
+
+                logger.debug("📬 Retrieved checkpoint for thread: %s", thread_id)
+                return checkpoint
+
+        except Exception as e:
+            logger.error("❌ Error retrieving checkpoint: %s", e)
+            return None
     
     async def aget_tuple(self, config: dict):
         """
@@ -203,27 +416,7 @@ class PostgresCheckpointer(BaseCheckpointSaver):
         Required by LangGraph's async workflow.
         Returns a CheckpointTuple named tuple.
         """
-        checkpoint = self.get(config)
-        if checkpoint is None:
-            return None
-        
-        # Create metadata dict
-        metadata = {
-            "source": "input",
-            "step": -1,
-            "writes": None,
-        }
-        parent_config = None
-        pending_writes = []
-        
-        # Return CheckpointTuple named tuple
-        return CheckpointTuple(
-            config=config,
-            checkpoint=checkpoint,
-            metadata=metadata,
-            parent_config=parent_config,
-            pending_writes=pending_writes
-        )
+        return self._to_tuple(config, await self.aget(config))
 
     async def aput(
         self,
@@ -232,13 +425,183 @@ class PostgresCheckpointer(BaseCheckpointSaver):
         metadata: CheckpointMetadata,
         new_versions: dict = None,
     ) -> dict:
-        """Async version of put - delegates to sync version"""
+        """
+        Async version of put.
+
+        With the batch writer running, the row is queued and written in a
+        multi-row INSERT shortly after; otherwise (or if the queue is full)
+        it is written straight away on the pooled async engine.
+        """
         # new_versions parameter is used by LangGraph but we don't need it for basic storage
-        return self.put(config, checkpoint, metadata)
+        thread_id = config.get("configurable", {}).get("thread_id", "default")
+
+        # The caller already got success for the lost checkpoint, so fail this one loudly
+        error = self._write_errors.pop(thread_id, None)
+        if error is not None:
+            raise CheckpointWriteError(f"An earlier checkpoint for thread {thread_id} was not saved") from error
+
+        row = self._build_row(thread_id, checkpoint, metadata)
+        digest = self._channel_digest(row)
+        if self._is_duplicate(thread_id, digest):
+            return config
+
+        if self._queue is not None:
+            entry = (row, digest)
+            try:
+                self._queue.put_nowait(entry)
+                self._pending[thread_id] = entry
+                return config
+            except asyncio.QueueFull:
+                logger.warning("⚠️ Checkpoint queue full, writing directly")
+
+        try:
+            await self._write_rows([row])
+            self._record_saved(thread_id, digest)
+            logger.debug("💾 Saved checkpoint for thread: %s", thread_id)
+
+        except Exception as e:
+            logger.error("❌ Error saving checkpoint: %s", e)
+            raise
+
+        return config
+
+    async def _write_rows(self, rows: list[dict]) -> None:
+        """Insert checkpoint rows in one transaction and one multi-row INSERT"""
+        async with self._get_async_session() as session:
+            # Ensure conversations exist
+            for thread_id in {row["thread_id"] for row in rows}:
+                await self._aensure_conversation_exists(session, thread_id)
+
+            await session.execute(insert(CheckpointModel), rows)
+
+    async def start_batch_writer(self) -> None:
+        """Start the background task that batches checkpoint writes"""
+        if self._writer_task is None:
+            self._queue = asyncio.Queue(maxsize=BATCH_QUEUE_SIZE)
+            self._writer_task = asyncio.create_task(self._batch_writer())
+            logger.info("✅ Checkpoint batch writer started")
+
+    async def drain_on_shutdown(self) -> None:
+        """Flush queued checkpoints and stop the batch writer"""
+        if self._writer_task is None:
+            return
+        await self._queue.join()
+        if self._write_errors:
+            logger.error("❌ Checkpoints lost for %d thread(s): %s", len(self._write_errors), ", ".join(self._write_errors))
+        self._writer_task.cancel()
+        try:
+            await self._writer_task
+        except asyncio.CancelledError:
+            pass
+        self._writer_task = None
+        self._queue = None
+        logger.info("✅ Checkpoint batch writer drained")
+
+    async def _batch_writer(self) -> None:
+        """Drain the queue in batches of up to BATCH_MAX_ROWS or BATCH_FLUSH_INTERVAL"""
+        loop = asyncio.get_running_loop()
+        while True:
+            entries = [await self._queue.get()]
+            deadline = loop.time() + BATCH_FLUSH_INTERVAL
+            while len(entries) < BATCH_MAX_ROWS:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    entries.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            try:
+                await self._flush(entries)
+            finally:
+                for entry in entries:
+                    thread_id = entry[0]["thread_id"]
+                    if self._pending.get(thread_id) is entry:
+                        del self._pending[thread_id]
+                    self._queue.task_done()
+
+    async def _flush(self, entries: list[tuple[dict, int]]) -> None:
+        """
+        Write a batch of (row, hash) entries from the queue, retrying before giving up on any row
+
+        aput has already returned for these rows, so failures can't be raised
+        to the caller here. Rows that still fail after retries and a per-row
+        fallback are recorded in _write_errors and raised by the thread's next aput.
+        """
+        rows = [row for row, _ in entries]
+        for attempt in range(1, BATCH_WRITE_ATTEMPTS + 1):
+            try:
+                await self._write_rows(rows)
+                for row, digest in entries:
+                    self._record_saved(row["thread_id"], digest)
+                logger.debug("💾 Saved %d checkpoint(s) in one batch", len(rows))
+                return
+            except Exception as e:
+                logger.warning("⚠️ Checkpoint batch failed (attempt %d/%d): %s", attempt, BATCH_WRITE_ATTEMPTS, e)
+                if attempt < BATCH_WRITE_ATTEMPTS:
+                    await asyncio.sleep(BATCH_RETRY_DELAY * 2 ** (attempt - 1))
+                last_error = e
+
+        if len(rows) == 1:
+            self._record_write_error(rows[0]["thread_id"], last_error)
+            return
+
+        # One bad row fails the whole INSERT; write them one by one so the rest still land
+        for row, digest in entries:
+            try:
+                await self._write_rows([row])
+                self._record_saved(row["thread_id"], digest)
+            except Exception as e:
+                self._record_write_error(row["thread_id"], e)
+
+    def _record_write_error(self, thread_id: str, error: Exception) -> None:
+        logger.error(
+            "❌ Checkpoint for thread %s was not saved: %s", thread_id, error,
+            exc_info=error if logger.isEnabledFor(logging.DEBUG) else None
+        )
+        self._write_errors[thread_id] = error
+
+    async def alist(self, config: dict, *, limit: int = 10, before: Optional[str] = None) -> list[Checkpoint]:
+        """Async version of list, on the pooled async engine"""
+        thread_id = config.get("configurable", {}).get("thread_id", "default")
+
+        # Let queued checkpoints land first so the listing is complete
+        if self._queue is not None:
+            await self._queue.join()
+
+        try:
+            async with self._get_async_session() as session:
+                checkpoint_records = (await session.execute(
+                    _LIST_STMTS[False, before is not None], _list_params(thread_id, limit, before)
+                )).scalars().all()
+
+                checkpoints = [self._record_to_checkpoint(record) for record in checkpoint_records]
 
-    async def alist(self, config: dict) -> list[Checkpoint]:
-        """Async version of list - delegates to sync version"""
-        return self.list(config)
+                logger.debug("📋 Listed %d checkpoints for thread: %s", len(checkpoints), thread_id)
+                return checkpoints
+
+        except Exception as e:
+            logger.error("❌ Error listing checkpoints: %s", e)
+            return []
+
+    async def alist_metadata(self, config: dict, *, limit: int = 10, before: Optional[str] = None) -> list[dict]:
+        """Async version of list_metadata, on the pooled async engine"""
+        thread_id = config.get("configurable", {}).get("thread_id", "default")
+
+        if self._queue is not None:
+            await self._queue.join()
+
+        try:
+            async with self._get_async_session() as session:
+                rows = (await session.execute(
+                    _LIST_STMTS[True, before is not None], _list_params(thread_id, limit, before)
+                )).mappings().all()
+                return [dict(row) for row in rows]
+
+        except Exception as e:
+            logger.error("❌ Error listing checkpoint metadata: %s", e)
+            return []
     
     async def aput_writes(self, config: dict, writes: list, task_id: str):
         """
@@ -250,12 +613,41 @@ class PostgresCheckpointer(BaseCheckpointSaver):
         # The full checkpoint is stored via aput()
         pass
 
-    def list(self, config: dict) -> list[Checkpoint]:
+    # list_metadata stays above list(): once list() is defined it shadows the
+    # builtin in the class body, breaking the `-> list[dict]` annotation below it
+    def list_metadata(self, config: dict, *, limit: int = 10, before: Optional[str] = None) -> list[dict]:
+        """
+        List checkpoint ids and metadata for a thread without loading checkpoint data.
+
+        Args:
+            config: Configuration dict with thread_id
+            limit: Maximum number of entries to return
+            before: Only return checkpoints older than this checkpoint_id
+
+        Returns:
+            List of dicts with checkpoint_id, parent_checkpoint_id, checkpoint_metadata, created_at
+        """
+        thread_id = config.get("configurable", {}).get("thread_id", "default")
+
+        try:
+            with self._get_session() as session:
+                rows = session.execute(
+                    _LIST_STMTS[True, before is not None], _list_params(thread_id, limit, before)
+                ).mappings().all()
+                return [dict(row) for row in rows]
+
+        except Exception as e:
+            logger.error("❌ Error listing checkpoint metadata: %s", e)
+            return []
+
+    def list(self, config: dict, *, limit: int = 10, before: Optional[str] = None) -> list[Checkpoint]:
         """
-        List all checkpoints for a thread.
+        List checkpoints for a thread, newest first.
 
         Args:
             config: Configuration dict with thread_id
+            limit: Maximum number of checkpoints to return
+            before: Only return checkpoints older than this checkpoint_id
 
         Returns:
             List of checkpoints
@@ -265,31 +657,60 @@ class PostgresCheckpointer(BaseCheckpointSaver):
         try:
             with self._get_session() as session:
                 checkpoint_records = session.execute(
-                    select(CheckpointModel)
-                    .where(CheckpointModel.thread_id == thread_id)
-                    .order_by(CheckpointModel.created_at.desc())
+                    _LIST_STMTS[False, before is not None], _list_params(thread_id, limit, before)
                 ).scalars().all()
 
-                checkpoints = []
-                for record in checkpoint_records:
-                    checkpoint_data = json.loads(record.checkpoint_data)
-                    checkpoint = {
-                        "v": checkpoint_data.get("v", 1),
-                        "ts": checkpoint_data.get("ts"),
-                        "id": checkpoint_data.get("id"),
-                        "channel_values": self._deserialize_channel_values(checkpoint_data.get("channel_values", {})),
-                        "channel_versions": checkpoint_data.get("channel_versions", {}),
-                        "versions_seen": checkpoint_data.get("versions_seen", {}),
-                    }
-                    checkpoints.append(checkpoint)
-
-                logger.info(f"📋 Listed {len(checkpoints)} checkpoints for thread: {thread_id}")
+                checkpoints = [self._record_to_checkpoint(record) for record in checkpoint_records]
+
+                logger.debug("📋 Listed %d checkpoints for thread: %s", len(checkpoints), thread_id)
                 return checkpoints
 
         except Exception as e:
-            logger.error(f"❌ Error listing checkpoints: {e}")
+            logger.error("❌ Error listing checkpoints: %s", e)
             return []
 
+    def _serialize_message(self, msg: Any) -> dict:
+        """
+        Serialize one LangChain message, reusing the result for messages already seen.
+
+        Every checkpoint re-saves the whole history, so only the messages appended
+        since the previous step actually get encoded. Entries are matched on the
+        message id and the object itself, so a replaced message is re-encoded.
+        """
+        msg_id = getattr(msg, "id", None)
+        if msg_id is not None:
+            hit = self._message_cache.get(msg_id)
+            if hit is not None and hit[0] is msg:
+                self._message_cache.move_to_end(msg_id)
+                return hit[1]
+
+        try:
+            # Every BaseMessage has these, so skip the per-attribute hasattr checks
+            serialized = {
+                "type": msg.type,
+                "content": msg.content,
+                "additional_kwargs": msg.additional_kwargs,
+                "tool_calls": getattr(msg, "tool_calls", []),
+            }
+        except AttributeError:
+            serialized = {
+                "type": getattr(msg, "type", "unknown"),
+                "content": getattr(msg, "content", str(msg)),
+                "additional_kwargs": getattr(msg, "additional_kwargs", {}),
+                "tool_calls": getattr(msg, "tool_calls", []),
+            }
+        else:
+            if serialized["type"] == "tool":
+                # Needed to pair the result with its AIMessage tool call on reload
+                serialized["tool_call_id"] = msg.tool_call_id
+                serialized["name"] = msg.name
+
+        if msg_id is not None:
+            self._message_cache[msg_id] = (msg, serialized)
+            if len(self._message_cache) > MESSAGE_CACHE_SIZE:
+                self._message_cache.popitem(last=False)
+        return serialized
+
     def _serialize_channel_values(self, channel_values: dict) -> dict:
         """
         Serialize channel values for storage.
@@ -300,19 +721,13 @@ class PostgresCheckpointer(BaseCheckpointSaver):
         for key, value in channel_values.items():
             if key == "messages" and isinstance(value, list):
                 # Serialize LangChain messages
-                serialized[key] = [
-                    {
-                        "type": msg.type if hasattr(msg, "type") else "unknown",
-                        "content": msg.content if hasattr(msg, "content") else str(msg),
-                        "additional_kwargs": getattr(msg, "additional_kwargs", {}),
-                        "tool_calls": getattr(msg, "tool_calls", []),
-                    }
-                    for msg in value
-                ]
+                serialized[key] = [self._serialize_message(msg) for msg in value]
+            elif isinstance(value, _JSON_SCALARS):
+                serialized[key] = value
             else:
                 # For other values, try to serialize as-is
                 try:
-                    json.dumps(value)  # Test if serializable
+                    msgpack.packb(value, use_bin_type=True)  # Test if serializable
                     serialized[key] = value
                 except (TypeError, ValueError):
                     # If not serializable, convert to string
@@ -326,33 +741,14 @@ class PostgresCheckpointer(BaseCheckpointSaver):
         
         Reconstructs LangChain messages and other special types.
         """
-        from langchain_core.messages import HumanMessage, AIMessage, SystemMessage, ToolMessage
-
         deserialized = {}
         for key, value in channel_values.items():
             if key == "messages" and isinstance(value, list):
-                # Reconstruct LangChain messages
-                messages = []
-                for msg_data in value:
-                    msg_type = msg_data.get("type", "unknown")
-                    content = msg_data.get("content", "")
-                    
-                    if msg_type == "human":
-                        messages.append(HumanMessage(content=content))
-                    elif msg_type == "ai":
-                        msg = AIMessage(content=content)
-                        msg.additional_kwargs = msg_data.get("additional_kwargs", {})
-                        msg.tool_calls = msg_data.get("tool_calls", [])
-                        messages.append(msg)
-                    elif msg_type == "system":
-                        messages.append(SystemMessage(content=content))
-                    elif msg_type == "tool":
-                        messages.append(ToolMessage(content=content, tool_call_id=msg_data.get("tool_call_id", "")))
-                    else:
-                        # Fallback to HumanMessage
-                        messages.append(HumanMessage(content=content))
-                
-                deserialized[key] = messages
+                # Reconstruct LangChain messages; unknown types fall back to HumanMessage
+                deserialized[key] = [
+                    _MESSAGE_BUILDERS.get(msg_data.get("type"), _build_human)(msg_data)
+                    for msg_data in value
+                ]
             else:
                 deserialized[key] = value
         
@@ -1,52 +1,101 @@
+import ahocorasick
+import asyncio
 import httpx
-import json
+import orjson
 import logging
-from functools import lru_cache
+import pickle
+from collections import ChainMap
 
 try:
     from .config import config
+    from .iata import IATA_INDEX_PATH, _build_city_index, _normalize_city, get_data_json
+    from .cache import EMPTY_TTL, TTLCache
+    from ._http import AUTH_HEADERS, coalesce, get_http_client, get_serp_semaphore, dump_response, close_http_client
 except ImportError:
     from config import config
+    from iata import IATA_INDEX_PATH, _build_city_index, _normalize_city, get_data_json
+    from cache import EMPTY_TTL, TTLCache
+    from _http import AUTH_HEADERS, coalesce, get_http_client, get_serp_semaphore, dump_response, close_http_client
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
-# Create a shared httpx client for connection pooling
-_http_client = None
+
+# ---------- Utility: Load city → IATA/ICAO index ----------
+def _load_city_index() -> dict[str, str]:
+    """Load the prebuilt city index (see build_iata_cache.py), falling back to IATA.json"""
+    try:
+        with open(IATA_INDEX_PATH, "rb") as f:
+            return pickle.load(f)
+    except FileNotFoundError:
+        logger.info("%s not found, building city index from IATA.json", IATA_INDEX_PATH)
+        return _build_city_index(get_data_json())
 
 
-def get_http_client() -> httpx.AsyncClient:
-    """Get or create the shared HTTP client"""
-    global _http_client
-    if _http_client is None:
-        _http_client = httpx.AsyncClient(timeout=30.0)
-    return _http_client
+# Loaded once at import so the first request never pays for it
+_CITY_INDEX = _load_city_index()
 
 
-async def close_http_client():
-    """Close the shared HTTP client"""
-    global _http_client
-    if _http_client is not None:
-        await _http_client.aclose()
-        _http_client = None
+# ---------- Utility: Get IATA/ICAO code from city ----------
+def get_iata(city_name: str) -> str | None:
+    return _CITY_INDEX.get(_normalize_city(city_name))
 
 
-# ---------- Utility: Load IATA data ----------
-@lru_cache(maxsize=10)
-def get_data_json():
-    file_path = "IATA.json"
-    with open(file_path, "r", encoding="utf-8") as f:
-        return json.load(f)
+# ---------- Utility: Find city mentions in free text ----------
+_city_automaton = None
 
 
-# ---------- Utility: Get IATA/ICAO code from city ----------
-@lru_cache(maxsize=50)
-def get_iata(city_name: str) -> str | None:
-    data = get_data_json()
-    for value in data.values():
-        if value.get("city", "").lower() == city_name.lower():
-            return value["iata"] or value["icao"]
-    return None
+def _get_city_automaton() -> ahocorasick.Automaton:
+    """Get or build the Aho-Corasick automaton over all known city names"""
+    global _city_automaton
+    if _city_automaton is None:
+        automaton = ahocorasick.Automaton()
+        for city, code in _CITY_INDEX.items():
+            automaton.add_word(city, (len(city), code))
+        automaton.make_automaton()
+        _city_automaton = automaton
+    return _city_automaton
+
+
+def extract_iata_codes(text: str) -> list[str]:
+    """
+    Return IATA/ICAO codes for every known city mentioned in text, in order.
+
+    Scans the whole message in one pass. Matches must sit on word boundaries,
+    and where cities overlap the leftmost-longest wins ("New York" over "York").
+    """
+    haystack = " ".join(text.split()).casefold()
+    matches = []
+    for end, (length, code) in _get_city_automaton().iter(haystack):
+        start = end - length + 1
+        if start > 0 and haystack[start - 1].isalnum():
+            continue
+        if end + 1 < len(haystack) and haystack[end + 1].isalnum():
+            continue
+        matches.append((start, -length, code))
+
+    codes = []
+    last_end = -1
+    for start, neg_length, code in sorted(matches):
+        if start > last_end:
+            codes.append(code)
+            last_end = start - neg_length - 1
+    return codes
+
+
+# ---------- Cache: Recent flight searches ----------
+# Successful responses only, keyed by (departure_iata, arrival_iata, outbound_date, is_round_trip, return_date);
+# searches without itineraries only last EMPTY_TTL
+FLIGHT_CACHE_TTL = 180  # seconds
+FLIGHT_CACHE_SIZE = 256
+_FLIGHT_CACHE = TTLCache(FLIGHT_CACHE_SIZE)
+# Searches currently running, so identical concurrent ones share the call
+_FLIGHT_INFLIGHT: dict[tuple, asyncio.Future] = {}
+
+
+def no_flights(flight_data: dict) -> bool:
+    """True when a flight search came back without any itineraries"""
+    return not (flight_data.get("other_flights") or flight_data.get("best_flights"))
 
 
 # ---------- Main: Fetch flight data ----------
@@ -57,38 +106,66 @@ async def get_flight_details(
     is_round_trip: bool = False,
     return_date: str | None = None,
 ):
-    """Fetches flight data from SearchAPI.io and saves the result to data.json"""
-
-    url = config.base_api_url
+    """Fetches flight data from SearchAPI.io, reusing recent results for the same search"""
 
     logger.info("🌐 FLIGHT SERVICE: get_flight_details called")
-    logger.info("   Input Parameters:")
-    logger.info(f"      departure city: {departure}")
-    logger.info(f"      arrival city: {arrival}")
-    logger.info(f"      outbound_date: {outbound_date}")
-    logger.info(f"      is_round_trip: {is_round_trip}")
-    logger.info(f"      return_date: {return_date}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("   Input Parameters:")
+        logger.debug("      departure city: %s", departure)
+        logger.debug("      arrival city: %s", arrival)
+        logger.debug("      outbound_date: %s", outbound_date)
+        logger.debug("      is_round_trip: %s", is_round_trip)
+        logger.debug("      return_date: %s", return_date)
 
     departure_iata = get_iata(departure)
     arrival_iata = get_iata(arrival)
 
-    logger.info("   IATA Code Conversion:")
-    logger.info(f"      {departure} → {departure_iata}")
-    logger.info(f"      {arrival} → {arrival_iata}")
+    logger.debug("   IATA Code Conversion: %s → %s, %s → %s", departure, departure_iata, arrival, arrival_iata)
 
     if not departure_iata or not arrival_iata:
         logger.error("   ❌ Failed to convert city names to IATA codes")
-        logger.error(f"      departure_iata: {departure_iata}, arrival_iata: {arrival_iata}")
-        print("❌ Invalid city names provided.")
+        logger.error("      departure_iata: %s, arrival_iata: %s", departure_iata, arrival_iata)
         return None
 
-    # Start with base params from config
-    params = config.default_flight_params.copy()
-    params.update({
+    cache_key = (departure_iata, arrival_iata, outbound_date, is_round_trip, return_date)
+    data = _FLIGHT_CACHE.get(cache_key)
+    if data is not None:
+        logger.info("   ♻️ Returning cached flight data")
+        return data
+
+    # Coalesce concurrent identical searches onto a single upstream call
+    return await coalesce(
+        _FLIGHT_INFLIGHT, cache_key,
+        lambda: _fetch_and_cache_flights(cache_key)
+    )
+
+
+async def _fetch_and_cache_flights(cache_key: tuple) -> dict | None:
+    """Fetch one search (cache_key holds all its arguments) and cache the response"""
+    data = await _fetch_flights(*cache_key)
+    if data is not None:
+        # Stored before the in-flight entry is dropped, so later callers hit the cache
+        ttl = EMPTY_TTL if no_flights(data) else FLIGHT_CACHE_TTL
+        _FLIGHT_CACHE.set(cache_key, data, ttl)
+    return data
+
+
+async def _fetch_flights(
+    departure_iata: str,
+    arrival_iata: str,
+    outbound_date: str,
+    is_round_trip: bool,
+    return_date: str | None,
+) -> dict | None:
+    """Calls SearchAPI.io for one route and returns the parsed response, or None on failure"""
+    url = config.base_api_url
+
+    # Layer per-call params over the read-only defaults without copying them
+    params = ChainMap({
         "departure_id": departure_iata,
         "arrival_id": arrival_iata,
         "outbound_date": outbound_date,
-    })
+    }, config.default_flight_params)
 
     # Handle round trip logic cleanly
     if is_round_trip:
@@ -97,43 +174,41 @@ async def get_flight_details(
             params["return_date"] = return_date
         else:
             logger.warning("⚠️ Round trip selected, but return_date not provided.")
-            print("⚠️ Round trip selected, but return_date not provided.")
-
-    headers = {
-        "Authorization": f"Bearer {config.serp_key}"
-    }
 
-    logger.info("   📡 Making API Request:")
-    logger.info(f"      URL: {url}")
-    logger.info(f"      Full Params: {json.dumps(params, indent=2)}")
-    logger.info(f"      Headers: Authorization: Bearer {config.serp_key[:20]}...")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("   📡 Making API Request:")
+        logger.debug("      URL: %s", url)
+        logger.debug("      Full Params: %s", orjson.dumps(dict(params), option=orjson.OPT_INDENT_2).decode())
+        logger.debug("      Headers: Authorization: Bearer %s...", config.serp_key[:20])
 
-    print(f"🔍 Fetching flights: {departure_iata} → {arrival_iata} ({params['flight_type']})...")
+    logger.info("🔍 Fetching flights: %s → %s (%s)...", departure_iata, arrival_iata, params["flight_type"])
 
     try:
         client = get_http_client()
-        response = await client.get(url, headers=headers, params=params)
+        async with get_serp_semaphore():
+            response = await client.get(url, headers=AUTH_HEADERS, params=params)
         
-        logger.info("   📥 API Response:")
-        logger.info(f"      Status Code: {response.status_code}")
-        logger.info(f"      Response Headers: {dict(response.headers)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("   📥 API Response:")
+            logger.debug("      Status Code: %s", response.status_code)
+            logger.debug("      Response Headers: %s", dict(response.headers))
 
         response.raise_for_status()
-        data = response.json()
+        data = orjson.loads(response.content)
     except httpx.HTTPError as e:
-        logger.error(f"   ❌ API Request failed: {e}", exc_info=True)
-        print(f"❌ Request failed: {e}")
+        logger.error("   ❌ API Request failed: %s", e, exc_info=logger.isEnabledFor(logging.DEBUG))
         return None
 
     logger.info("   ✅ Response received successfully")
-    logger.info(f"      Response keys: {list(data.keys())}")
-    logger.info(f"      Response preview: {json.dumps(data, indent=2)[:500]}...")
+    if logger.isEnabledFor(logging.DEBUG):
+        # Previewing re-encodes the whole response, so only do it when it will be shown
+        logger.debug("      Response keys: %s", list(data.keys()))
+        logger.debug("      Response preview: %s...", orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()[:500])
 
-    # ✅ Save to JSON
-    with open("data.json", "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
-
-    print("✅ Flight data saved to data.json")
+    # Raw response is only kept on disk when debugging
+    dump_path = await dump_response("data", response.content)
+    if dump_path:
+        logger.debug("   💾 Flight data saved to %s", dump_path)
 
     return data
 
@@ -150,8 +225,9 @@ def parse_flight_data_to_toon(flight_data: dict) -> tuple[str, dict]:
         # Return empty results
         return "No flights found.", {"flights": []}
     
-    toon_response = f"""flights [{len(flights_list)}] {{idx, price, duration, stops, departure, arrival, airline, flight_num}}
-    """
+    # Collect lines and join once instead of re-copying the string on every +=
+    toon_parts = [f"""flights [{len(flights_list)}] {{idx, price, duration, stops, departure, arrival, airline, flight_num}}
+    """]
 
     # Build full data structure for UI
     full_data = {
@@ -186,9 +262,9 @@ def parse_flight_data_to_toon(flight_data: dict) -> tuple[str, dict]:
             arr = seg.get("arrival_airport", {}).get("id", "N/A")
             airline = seg.get("airline", "Unknown")
             flight_num = seg.get("flight_number", "N/A")
-            toon_response += f"\t\t{idx},{price},{duration},{stops},{dep},{arr},{airline},{flight_num}\n"
+            toon_parts.append(f"\t\t{idx},{price},{duration},{stops},{dep},{arr},{airline},{flight_num}\n")
 
-    return toon_response, full_data
+    return "".join(toon_parts), full_data
 
 
 # ---------- Entry point ----------
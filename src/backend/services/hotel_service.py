@@ -1,71 +1,86 @@
 import httpx
-import json
 import logging
+import orjson
+import sys
+from collections import ChainMap
 
 try:
     from .config import config
+    from ._http import AUTH_HEADERS, get_http_client, get_serp_semaphore, dump_response, close_http_client
+    from .cache import EMPTY_TTL, TTLCache
 except ImportError:
     from config import config
+    from _http import AUTH_HEADERS, get_http_client, get_serp_semaphore, dump_response, close_http_client
+    from cache import EMPTY_TTL, TTLCache
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
-# Create a shared httpx client for connection pooling
-_http_client = None
 
+# Successful responses only, keyed by (check_in_date, check_out_date, q)
+HOTEL_CACHE_TTL = 15 * 60  # seconds
+HOTEL_CACHE_SIZE = 256
+_HOTEL_CACHE = TTLCache(HOTEL_CACHE_SIZE)
 
-def get_http_client() -> httpx.AsyncClient:
-    """Get or create the shared HTTP client"""
-    global _http_client
-    if _http_client is None:
-        _http_client = httpx.AsyncClient(timeout=30.0)
-    return _http_client
-
-
-async def close_http_client():
-    """Close the shared HTTP client"""
-    global _http_client
-    if _http_client is not None:
-        await _http_client.aclose()
-        _http_client = None
+# Property fields read by parse_hotel_json; everything else is dropped after parsing
+_HOTEL_FIELDS = (
+    "type", "name", "gps_coordinates", "city", "country",
+    "check_in_time", "check_out_time", "price_per_night", "total_price", "offers",
+    "rating", "reviews", "location_rating", "proximity_to_transit_rating",
+    "airport_access_rating", "amenities", "essential_info", "images",
+)
 
 
 async def get_hotel_details(check_in_date: str, check_out_date: str, q: str):
     """Fetches hotel data from SearchAPI.io"""
-    base_url: str = config.base_api_url
-    hotel_params: dict = config.default_hotel_params.copy()
-    headers = {
-        "Authorization": f"Bearer {config.serp_key}"
-    }
+    cache_key = (check_in_date, check_out_date, q)
+    cached = _HOTEL_CACHE.get(cache_key)
+    if cached is not None:
+        logger.info("🏨 HOTEL SERVICE: cache hit for %s", q)
+        return cached
 
-    hotel_params.update({
+    base_url: str = config.base_api_url
+    hotel_params = ChainMap({
         "q": q,
         "check_in_date": check_in_date,
         "check_out_date": check_out_date
-    })
+    }, config.default_hotel_params)
     
     logger.info("🏨 HOTEL SERVICE: get_hotel_details called")
-    logger.info(f"   Location: {q}")
-    logger.info(f"   Check-in: {check_in_date}, Check-out: {check_out_date}")
+    logger.debug("   Location: %s", q)
+    logger.debug("   Check-in: %s, Check-out: %s", check_in_date, check_out_date)
     
     try:
         client = get_http_client()
-        response = await client.get(url=base_url, headers=headers, params=hotel_params)
+        async with get_serp_semaphore():
+            response = await client.get(url=base_url, headers=AUTH_HEADERS, params=hotel_params)
         
         if response.status_code == 200:
-            hotel_data = response.json()
-            with open('hotel_data.json', 'w') as f:
-                json.dump(hotel_data, f, indent=2)
-            logger.info(f"   ✅ Found {len(hotel_data.get('properties', []))} hotels")
+            # Parse the raw bytes directly, keeping only the fields used downstream
+            properties = [
+                {field: prop[field] for field in _HOTEL_FIELDS if field in prop}
+                for prop in orjson.loads(response.content).get("properties", [])
+            ]
+            hotel_data = {"properties": properties}
+            # Empty results may just be a transient SearchAPI miss, so keep them briefly
+            ttl = EMPTY_TTL if no_hotels(hotel_data) else HOTEL_CACHE_TTL
+            _HOTEL_CACHE.set(cache_key, hotel_data, ttl)
+            # Raw response is only kept on disk when debugging
+            await dump_response("hotel_data", response.content)
+            logger.info("   ✅ Found %d hotels", len(properties))
             return hotel_data
         else:
-            logger.error(f"   ❌ API returned status code: {response.status_code}")
+            logger.error("   ❌ API returned status code: %s", response.status_code)
             return None
     except httpx.HTTPError as e:
-        logger.error(f"   ❌ Request failed: {e}", exc_info=True)
-        print(e)
+        logger.error("   ❌ Request failed: %s", e, exc_info=logger.isEnabledFor(logging.DEBUG))
         return None
     
+def no_hotels(hotel_data: dict) -> bool:
+    """True when a hotel search came back without any properties"""
+    return not hotel_data.get("properties")
+
+
 def parse_hotel_json(data: dict) -> tuple[str, dict]:
     """
     Returns (toon_string, full_data_dict)
@@ -75,7 +90,7 @@ def parse_hotel_json(data: dict) -> tuple[str, dict]:
     properties = data.get('properties', [])
 
     # TOON: Compact format for agent to analyze and filter
-    property_toon = f"""properties [{len(properties)}] {{idx, name, city, country, price_per_night, total_price, rating, reviews, location_rating, amenities_summary}}\n"""
+    property_toon = [f"""properties [{len(properties)}] {{idx, name, city, country, price_per_night, total_price, rating, reviews, location_rating, amenities_summary}}\n"""]
 
     # Full data: Everything the UI will need
     full_data = {'properties': []}
@@ -95,7 +110,7 @@ def parse_hotel_json(data: dict) -> tuple[str, dict]:
         total_price = p.get("total_price", {}).get("extracted_price_before_taxes", "N/A")
 
         # TOON line: Only essentials for comparison
-        property_toon += f"\t\t{idx},{p.get('name', 'N/A')},{p.get('city', 'N/A')},{p.get('country', 'N/A')},{price_per_night},{total_price},{p.get('rating', 0.0)},{p.get('reviews', 0)},{p.get('location_rating', 0.0)},{amenities_summary}\n"
+        property_toon.append(f"\t\t{idx},{p.get('name', 'N/A')},{p.get('city', 'N/A')},{p.get('country', 'N/A')},{price_per_night},{total_price},{p.get('rating', 0.0)},{p.get('reviews', 0)},{p.get('location_rating', 0.0)},{amenities_summary}\n")
 
         # Full data: Complete information including images, GPS, offers
         full_data['properties'].append({
@@ -120,17 +135,21 @@ def parse_hotel_json(data: dict) -> tuple[str, dict]:
             "images": p.get("images", [])
         })
 
-    return property_toon, full_data
+    return "".join(property_toon), full_data
 
 def print_parsed_info(parsed_data: dict):
-    print("=="*5,"PROPERTIES","=="*5)
-    print(f"Found properties: {len(parsed_data['properties'])}")
+    # Build the whole report first and write it with a single call
+    lines = [
+        f"{'=='*5} PROPERTIES {'=='*5}",
+        f"Found properties: {len(parsed_data['properties'])}",
+    ]
     for p in parsed_data["properties"]:
-        print(f"Property: {p['name']},{p['city']} Rating: {p['rating']}/({p['reviews']})")
-        print(f"Check in time: {p['check_in_time']}")
-        print(f"Check out time: {p['check_out_time']}")
-        print(f"Per night cost: {p['price_per_night']}, Total Price: {p['total_price']}")
-        print("\n","--"*5,"\n")
+        lines.append(f"Property: {p['name']},{p['city']} Rating: {p['rating']}/({p['reviews']})")
+        lines.append(f"Check in time: {p['check_in_time']}")
+        lines.append(f"Check out time: {p['check_out_time']}")
+        lines.append(f"Per night cost: {p['price_per_night']}, Total Price: {p['total_price']}")
+        lines.append(f"\n {'--'*5} \n")
+    sys.stdout.write("\n".join(lines) + "\n")
 
     
 
@@ -0,0 +1,52 @@
+"""
+IATA.json table and the city → IATA/ICAO index built from it
+
+Kept free of config (and its required API keys) so build_iata_cache.py
+can run at image build time without any secrets.
+"""
+
+import mmap
+from pathlib import Path
+
+import orjson
+
+
+# ---------- Utility: Load IATA data ----------
+# Resolved relative to the backend root so loading doesn't depend on the CWD
+_BACKEND_DIR = Path(__file__).resolve().parent.parent
+IATA_PATH = _BACKEND_DIR / "IATA.json"
+IATA_INDEX_PATH = _BACKEND_DIR / "IATA_index.pkl"
+
+
+def _load_iata() -> dict:
+    # Parse straight from the mapped pages, skipping the read() copy
+    with open(IATA_PATH, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        with memoryview(mm) as view:
+            return orjson.loads(view)
+
+
+_IATA_DATA = None
+
+
+def get_data_json() -> dict:
+    """Get the full IATA.json table, parsed on first use"""
+    global _IATA_DATA
+    if _IATA_DATA is None:
+        _IATA_DATA = _load_iata()
+    return _IATA_DATA
+
+
+# ---------- Utility: Build city → IATA/ICAO index ----------
+def _normalize_city(name: str) -> str:
+    """Casefold and collapse whitespace so 'NEW  Delhi ' matches 'New Delhi'"""
+    return " ".join(name.split()).casefold()
+
+
+def _build_city_index(data: dict) -> dict[str, str]:
+    """Map normalized city names to their IATA (or ICAO) code, first match wins"""
+    index = {}
+    for value in data.values():
+        city = value.get("city")
+        if city:
+            index.setdefault(_normalize_city(city), value["iata"] or value["icao"])
+    return index
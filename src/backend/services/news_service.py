@@ -1,105 +1,219 @@
-import json
+import asyncio
+import csv
 import httpx
+import io
 import logging
+import orjson
+import re
+import sys
+from operator import itemgetter
+
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_exponential
 
 try:
     from .config import config
+    from .cache import EMPTY_TTL, TTLCache
+    from ._http import AUTH_HEADERS, LOOP_FACTORY, coalesce, get_http_client, get_serp_semaphore, dump_response, close_http_client
 except ImportError:
     from config import config
+    from cache import EMPTY_TTL, TTLCache
+    from _http import AUTH_HEADERS, LOOP_FACTORY, coalesce, get_http_client, get_serp_semaphore, dump_response, close_http_client
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
-# Create a shared httpx client for connection pooling
-_http_client = None
+# The only article fields parse_news_data reads; everything else is dropped after parsing
+_NEWS_FIELDS = ("position", "title", "link", "source", "date", "snippet", "favicon", "thumbnail")
+_NEWS_FIELD_SET = frozenset(_NEWS_FIELDS)
+_get_news_fields = itemgetter(*_NEWS_FIELDS)
+
+
+def _project_article(article: dict) -> dict:
+    """Keep only _NEWS_FIELDS; missing fields stay missing so parse_news_data's defaults apply"""
+    if _NEWS_FIELD_SET <= article.keys():
+        # Common case: every field present, so extract them all in one C call
+        return dict(zip(_NEWS_FIELDS, _get_news_fields(article)))
+    return {field: article[field] for field in _NEWS_FIELDS if field in article}
+
+# ---------- In-process cache: news tolerates a few minutes of staleness ----------
+NEWS_CACHE_TTL = 300  # seconds, unless the response sends its own max-age
+NEWS_CACHE_SIZE = 256
+# cache_key -> (news_data, etag); expired entries stay around so their ETag
+# can be revalidated with If-None-Match. Failed fetches ({}) are not cached,
+# and searches without articles only last EMPTY_TTL
+_NEWS_CACHE = TTLCache(NEWS_CACHE_SIZE)
+# Queries currently being fetched, so identical concurrent ones share the call
+_NEWS_INFLIGHT: dict[str, asyncio.Future] = {}
 
+_MAX_AGE_RE = re.compile(r"max-age=(\d+)")
 
-def get_http_client() -> httpx.AsyncClient:
-    """Get or create the shared HTTP client"""
-    global _http_client
-    if _http_client is None:
-        _http_client = httpx.AsyncClient(timeout=30.0)
-    return _http_client
+# ---------- Retries: transient SearchAPI failures get two more attempts ----------
+NEWS_RETRY_ATTEMPTS = 3
+NEWS_RETRY_MAX_WAIT = 4.0  # seconds, also caps Retry-After
+_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+_backoff = wait_exponential(multiplier=0.5, max=NEWS_RETRY_MAX_WAIT)
 
 
-async def close_http_client():
-    """Close the shared HTTP client"""
-    global _http_client
-    if _http_client is not None:
-        await _http_client.aclose()
-        _http_client = None
+def no_news(news_data: dict) -> bool:
+    """True when a news search came back without any articles"""
+    return not news_data.get("organic_results")
+
+
+def _cache_ttl(response: httpx.Response) -> int:
+    """Use the response's Cache-Control max-age when it sends one"""
+    match = _MAX_AGE_RE.search(response.headers.get("cache-control", ""))
+    return int(match.group(1)) if match else NEWS_CACHE_TTL
 
 
 async def get_news(query: str) -> dict:
-    """Fetches news data from SearchAPI.io"""
-    base_url: str = config.base_api_url
-    news_params: dict = config.default_news_params.copy()
-    news_params.update(
-        {"q": query}
-    )
-    headers: dict = {
-        "Authorization": f"Bearer {config.serp_key}"
-    }
+    """Fetches news data from SearchAPI.io, reusing recent results for the same query"""
+    cache_key = query.strip().lower()
+    cached = _NEWS_CACHE.get(cache_key)
+    if cached is not None:
+        logger.info("📰 NEWS SERVICE: cache hit for %s", query)
+        return cached[0]
+
+    # Coalesce concurrent identical queries onto a single upstream call
+    return await coalesce(_NEWS_INFLIGHT, cache_key, lambda: _fetch_and_cache_news(cache_key, query))
+
+
+async def _fetch_and_cache_news(cache_key: str, query: str) -> dict:
+    """Fetch (or revalidate) one query and cache the result"""
+    stale = _NEWS_CACHE.peek(cache_key)
+    data, etag, ttl = await _fetch_news(query, etag=stale[1] if stale else None)
+    if data is None:
+        # 304 Not Modified: the expired copy is still current
+        logger.info("📰 NEWS SERVICE: not modified for %s", query)
+        data = stale[0]
+    if data:
+        if no_news(data):
+            ttl = min(ttl, EMPTY_TTL)
+        _NEWS_CACHE.set(cache_key, (data, etag), ttl)
+    return data
+
+
+def _is_transient(exc: BaseException) -> bool:
+    """Network errors, rate limits and 5xx are worth retrying; other 4xx are not"""
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code in _RETRY_STATUSES
+    return isinstance(exc, httpx.TransportError)
+
+
+def _retry_wait(retry_state) -> float:
+    """Honour a numeric Retry-After on 429/503, otherwise back off exponentially"""
+    exc = retry_state.outcome.exception()
+    if isinstance(exc, httpx.HTTPStatusError):
+        retry_after = exc.response.headers.get("retry-after", "")
+        if retry_after.isdigit():
+            return min(float(retry_after), NEWS_RETRY_MAX_WAIT)
+    return _backoff(retry_state)
+
+
+@retry(
+    stop=stop_after_attempt(NEWS_RETRY_ATTEMPTS),
+    wait=_retry_wait,
+    retry=retry_if_exception(_is_transient),
+    reraise=True,
+)
+async def _request_news(params: dict, headers) -> httpx.Response:
+    """One SearchAPI news request; the semaphore is released while waiting to retry"""
+    async with get_serp_semaphore():
+        response = await get_http_client().get(url=config.base_api_url, params=params, headers=headers)
+    # 304 answers a conditional request; raise_for_status() would treat it as an error
+    if response.status_code != httpx.codes.NOT_MODIFIED:
+        response.raise_for_status()
+    return response
+
+
+async def _fetch_news(query: str, etag: str | None = None) -> tuple[dict | None, str | None, int]:
+    """
+    Calls SearchAPI.io for news matching query
+
+    Returns (news_data, etag, ttl). With an etag the request is conditional,
+    and news_data is None when the server answers 304 Not Modified.
+    """
+    news_params: dict = {**config.default_news_params, "q": query}
+    headers = AUTH_HEADERS if etag is None else {**AUTH_HEADERS, "If-None-Match": etag}
 
     logger.info("📰 NEWS SERVICE: get_news called")
-    logger.info(f"   Query: {query}")
+    logger.info("   Query: %s", query)
 
     try:
-        client = get_http_client()
-        response = await client.get(url=base_url, params=news_params, headers=headers)
-        
-        if response.status_code == 200:
-            news_data: dict = response.json()
-            with open('news_data.json', 'w') as f:
-                json.dump(news_data, f)
-            logger.info(f"   ✅ Found {len(news_data.get('organic_results', []))} news articles")
-            return news_data
-        else:
-            logger.error(f"   ❌ API returned status code: {response.status_code}")
-            return {}
+        response = await _request_news(news_params, headers)
+    except httpx.HTTPStatusError as e:
+        logger.error("   ❌ API returned status code: %s: %s", e.response.status_code, e.response.text[:200])
+        return {}, None, NEWS_CACHE_TTL
     except httpx.HTTPError as e:
-        logger.error(f"   ❌ Request failed: {e}", exc_info=True)
-        print(e)
-        return {}
-
-def parse_news_data(news_json: dict) -> tuple[str, dict]:
+        logger.error("   ❌ Request failed: %s", e, exc_info=logger.isEnabledFor(logging.DEBUG))
+        return {}, None, NEWS_CACHE_TTL
+
+    if response.status_code == httpx.codes.NOT_MODIFIED:
+        return None, response.headers.get("etag", etag), _cache_ttl(response)
+
+    # Parse the raw bytes directly; skips httpx's text decode and stdlib json
+    organic_results = orjson.loads(response.content).get("organic_results", [])
+    # Keep only the article fields used downstream (metadata, pagination etc. are dropped)
+    articles = [_project_article(article) for article in organic_results]
+    news_data = {"organic_results": articles}
+    # Raw response is only kept on disk when debugging
+    await dump_response("news_data", response.content)
+    logger.info("   ✅ Found %d news articles", len(articles))
+    return news_data, response.headers.get("etag"), _cache_ttl(response)
+
+def parse_news_data(news_json: dict, organic_results: list | None = None) -> tuple[str, dict]:
     """
     Returns (toon_string, full_data_dict)
     - toon_string: Lightweight format for LLM reasoning
     - full_data_dict: Complete news data with images, links, thumbnails for UI
+
+    Callers that already looked up news_json['organic_results'] can pass it in.
     """
-    organic_results = news_json.get('organic_results', [])
+    if organic_results is None:
+        organic_results = news_json.get('organic_results', ())
 
     # TOON: Compact format for agent to analyze and filter
-    news_toon = f"""news_articles [{len(organic_results)}] {{idx, title, source, date, snippet}}\n"""
+    # Rows go through csv.writer so commas, quotes and newlines in titles/snippets are escaped
+    news_toon = io.StringIO()
+    news_toon.write(f"""news_articles [{len(organic_results)}] {{idx, title, source, date, snippet}}\n""")
+
+    # Full data: Everything the UI will need (pre-sized, filled by index)
+    articles = [None] * len(organic_results)
+    full_data = {'articles': articles}
 
-    # Full data: Everything the UI will need
-    full_data = {'articles': []}
+    # Bind the hot per-article methods once
+    write_row = csv.writer(news_toon, lineterminator="\n").writerow
+    intern = sys.intern
 
     for idx, article in enumerate(organic_results, 1):
+        get = article.get
+
         # Extract key information for TOON
-        title = article.get('title', 'N/A')
-        source = article.get('source', 'N/A')
-        date = article.get('date', 'N/A')
-        snippet = article.get('snippet', 'N/A')
+        title = get('title', 'N/A')
+        # Sources and dates repeat across articles; interned, the repeats share one object.
+        # sys.intern only takes str, so null or non-string values fall back to 'N/A'
+        source = get('source')
+        source = intern(source) if isinstance(source, str) else 'N/A'
+        date = get('date')
+        date = intern(date) if isinstance(date, str) else 'N/A'
+        snippet = get('snippet', 'N/A')
 
         # TOON line: Only essentials for comparison
-        news_toon += f"\t\t{idx},{title},{source},{date},{snippet}\n"
+        write_row((f"\t\t{idx}", title, source, date, snippet))
 
         # Full data: Complete information including links, thumbnails, images
-        full_data['articles'].append({
+        articles[idx - 1] = {
             "idx": idx,  # For agent to reference this article
-            "position": article.get('position'),
+            "position": get('position'),
             "title": title,
-            "link": article.get('link', ''),
+            "link": get('link', ''),
             "source": source,
             "date": date,
             "snippet": snippet,
-            "favicon": article.get('favicon', ''),
-            "thumbnail": article.get('thumbnail', '')
-        })
+            "favicon": get('favicon', ''),
+            "thumbnail": get('thumbnail', '')
+        }
 
-    return news_toon, full_data
+    return news_toon.getvalue(), full_data
 
 
 if __name__ == "__main__":
@@ -122,5 +236,5 @@ if __name__ == "__main__":
         
         await close_http_client()
     
-    asyncio.run(test())
+    asyncio.run(test(), loop_factory=LOOP_FACTORY)
 
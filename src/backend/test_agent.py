@@ -2,9 +2,11 @@
 Test script for the Travel Planning AI Agent
 
 Run this to test the agent's capabilities:
-    python test_agent.py
+    python test_agent.py [--interactive-between-tests]
 """
 
+import argparse
+import asyncio
 import sys
 import os
 from dotenv import load_dotenv
@@ -15,7 +17,8 @@ load_dotenv()
 # Add services directory to path for imports
 sys.path.insert(0, os.path.dirname(__file__))
 
-from services import chat, get_stored_data, clear_data_store
+from services import chat
+from services._http import LOOP_FACTORY, warm_http_client, close_http_client
 
 
 def print_separator(char="=", length=70):
@@ -23,8 +26,8 @@ def print_separator(char="=", length=70):
     print(f"\n{char * length}\n")
 
 
-def test_agent():
-    """Test the AI agent with various queries"""
+async def test_agent(interactive_between_tests=False):
+    """Test the AI agent with various queries (run concurrently)"""
 
     print("🤖 Travel Planning AI Agent - Test Suite")
     print_separator()
@@ -53,20 +56,35 @@ def test_agent():
         }
     ]
 
-    for idx, test_case in enumerate(test_cases, 1):
+    # The HTTP client belongs to this asyncio.run() loop, so close it here
+    try:
+        # Connect to SearchAPI up front so the first case isn't charged for it
+        await warm_http_client()
+
+        # The cases use separate threads, so they can run side by side
+        results = await asyncio.gather(
+            *[
+                chat(user_message=test_case['query'], thread_id=test_case['thread_id'])
+                for test_case in test_cases
+            ],
+            return_exceptions=True
+        )
+    finally:
+        await close_http_client()
+
+    for idx, (test_case, result) in enumerate(zip(test_cases, results), 1):
         print(f"TEST {idx}: {test_case['name']}")
         print_separator("-")
 
         print(f"USER QUERY: {test_case['query']}")
         print()
 
-        try:
-            # Call the agent
-            result = chat(
-                user_message=test_case['query'],
-                thread_id=test_case['thread_id']
-            )
-
+        if isinstance(result, Exception):
+            print(f"❌ ERROR: {str(result)}")
+            print_separator()
+            import traceback
+            traceback.print_exception(result)
+        else:
             # Print the response
             print("AGENT RESPONSE:")
             print(result['response'])
@@ -83,14 +101,8 @@ def test_agent():
 
             print_separator()
 
-        except Exception as e:
-            print(f"❌ ERROR: {str(e)}")
-            print_separator()
-            import traceback
-            traceback.print_exc()
-
         # Ask if user wants to continue
-        if idx < len(test_cases):
+        if interactive_between_tests and idx < len(test_cases):
             response = input("\nPress Enter to continue to next test (or 'q' to quit): ")
             if response.lower() == 'q':
                 break
@@ -98,6 +110,15 @@ def test_agent():
     print("\n✅ Testing completed!")
 
 
+async def interactive_turn(user_input, thread_id):
+    """One interactive query; the HTTP client is opened and closed on this turn's loop"""
+    try:
+        await warm_http_client()
+        return await chat(user_message=user_input, thread_id=thread_id)
+    finally:
+        await close_http_client()
+
+
 def interactive_mode():
     """Interactive chat mode with the agent"""
 
@@ -119,13 +140,8 @@ def interactive_mode():
                 print("\n👋 Goodbye!")
                 break
 
-            if user_input.lower() == 'clear':
-                clear_data_store()
-                print("🧹 Data store cleared!")
-                continue
-
             # Get agent response
-            result = chat(user_message=user_input, thread_id=thread_id)
+            result = asyncio.run(interactive_turn(user_input, thread_id), loop_factory=LOOP_FACTORY)
 
             print(f"\nAGENT: {result['response']}")
 
@@ -147,6 +163,14 @@ def interactive_mode():
 def main():
     """Main entry point"""
 
+    parser = argparse.ArgumentParser(description="Test the Travel Planning AI Agent")
+    parser.add_argument(
+        "--interactive-between-tests",
+        action="store_true",
+        help="Pause for Enter between automated test results"
+    )
+    args = parser.parse_args()
+
     print("\nChoose mode:")
     print("1. Run automated tests")
     print("2. Interactive chat mode")
@@ -154,7 +178,7 @@ def main():
     choice = input("\nEnter choice (1 or 2): ").strip()
 
     if choice == "1":
-        test_agent()
+        asyncio.run(test_agent(args.interactive_between_tests), loop_factory=LOOP_FACTORY)
     elif choice == "2":
         interactive_mode()
     else:
@@ -0,0 +1,15 @@
+"""
+Shared pytest setup
+
+Settings are loaded at import time, so the required keys get dummy values
+before any service module is imported. No test talks to a real API or database.
+"""
+
+import os
+import sys
+
+os.environ.setdefault("SEARCH_API_KEY", "test-search-key")
+os.environ.setdefault("OPENAI_API_KEY", "test-openai-key")
+
+# Run from src/backend like the app itself (python main.py / uvicorn main:app)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,92 @@
+"""
+PostgresCheckpointer write-path tests; _write_rows is replaced, so no database is needed
+"""
+
+import asyncio
+
+import pytest
+
+from services import db_checkpointer
+from services.db_checkpointer import CheckpointWriteError, PostgresCheckpointer
+
+
+def make_entry(checkpointer, thread_id, checkpoint_id="c1", text="hi"):
+    """A (row, hash) queue entry, as aput enqueues it"""
+    checkpoint = {"id": checkpoint_id, "channel_values": {"note": text}}
+    row = checkpointer._build_row(thread_id, checkpoint, {"step": 1})
+    return row, checkpointer._channel_digest(row)
+
+
+@pytest.fixture
+def checkpointer(monkeypatch):
+    monkeypatch.setattr(db_checkpointer, "BATCH_RETRY_DELAY", 0)
+    return PostgresCheckpointer()
+
+
+def test_flush_retries_a_failed_batch(checkpointer):
+    calls = []
+
+    async def write_rows(rows):
+        calls.append(len(rows))
+        if len(calls) < 3:
+            raise ConnectionError("database restarting")
+
+    checkpointer._write_rows = write_rows
+    asyncio.run(checkpointer._flush([make_entry(checkpointer, "a"), make_entry(checkpointer, "b")]))
+
+    assert calls == [2, 2, 2]
+    assert checkpointer._write_errors == {}
+
+
+def test_flush_falls_back_to_rows_and_surfaces_the_lost_one(checkpointer):
+    saved = []
+
+    async def write_rows(rows):
+        if any(row["thread_id"] == "bad" for row in rows):
+            raise ValueError("bad row")
+        saved.extend(row["thread_id"] for row in rows)
+
+    checkpointer._write_rows = write_rows
+    entries = [make_entry(checkpointer, "good"), make_entry(checkpointer, "bad"), make_entry(checkpointer, "other")]
+    asyncio.run(checkpointer._flush(entries))
+
+    assert saved == ["good", "other"]
+    assert list(checkpointer._write_errors) == ["bad"]
+    # Only confirmed writes count for duplicate detection
+    assert list(checkpointer._last_hash) == ["good", "other"]
+
+    # The next save on the affected thread reports the loss instead of carrying on
+    config = {"configurable": {"thread_id": "bad"}}
+    with pytest.raises(CheckpointWriteError):
+        asyncio.run(checkpointer.aput(config, {"id": "c2", "channel_values": {}}, {}))
+    assert checkpointer._write_errors == {}
+
+
+def test_identical_checkpoint_is_retried_after_a_failed_write(checkpointer):
+    attempts = []
+
+    async def write_rows(rows):
+        attempts.append(rows[0]["checkpoint_id"])
+        if len(attempts) == 1:
+            raise ConnectionError("database restarting")
+
+    checkpointer._write_rows = write_rows
+    config = {"configurable": {"thread_id": "t"}}
+    checkpoint = {"id": "c1", "channel_values": {"note": "hi"}}
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(checkpointer.aput(config, checkpoint, {}))
+    # Same channel values again: not a duplicate, since nothing was written
+    asyncio.run(checkpointer.aput(config, {**checkpoint, "id": "c2"}, {}))
+    # Now it was written, so a third identical save is skipped
+    asyncio.run(checkpointer.aput(config, {**checkpoint, "id": "c3"}, {}))
+
+    assert attempts == ["c1", "c2"]
+
+
+def test_last_hash_is_bounded(checkpointer, monkeypatch):
+    monkeypatch.setattr(db_checkpointer, "LAST_HASH_CACHE_SIZE", 2)
+    for thread_id in ("a", "b", "c"):
+        checkpointer._record_saved(thread_id, 1)
+
+    assert list(checkpointer._last_hash) == ["b", "c"]
@@ -0,0 +1,68 @@
+"""
+flight_service tests; the SearchAPI call (_fetch_flights) is replaced
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from services import flight_service
+
+
+@pytest.fixture(autouse=True)
+def clear_flight_cache():
+    flight_service._FLIGHT_CACHE.clear()
+    yield
+    flight_service._FLIGHT_CACHE.clear()
+
+
+# A failed search (None) isn't cached, so waiters must still share the one call
+@pytest.mark.parametrize("response", [{"best_flights": [{"price": 100}]}, None])
+def test_concurrent_identical_searches_share_one_call(monkeypatch, response):
+    calls = []
+
+    async def fetch_flights(*args):
+        calls.append(args)
+        await asyncio.sleep(0.01)
+        return response
+
+    monkeypatch.setattr(flight_service, "_fetch_flights", fetch_flights)
+
+    async def run():
+        # Staggered starts: late callers arrive while the first call is still running
+        first = asyncio.create_task(flight_service.get_flight_details("Mumbai", "Delhi", "2025-12-15"))
+        await asyncio.sleep(0)
+        rest = [flight_service.get_flight_details("Mumbai", "Delhi", "2025-12-15") for _ in range(4)]
+        return await asyncio.gather(first, *rest)
+
+    results = asyncio.run(run())
+
+    assert len(calls) == 1
+    assert all(result == results[0] for result in results)
+    assert flight_service._FLIGHT_INFLIGHT == {}
+
+
+def test_search_without_itineraries_is_cached_briefly(monkeypatch):
+    async def fetch_flights(*args):
+        return {"search_metadata": {"status": "Success"}}
+
+    monkeypatch.setattr(flight_service, "_fetch_flights", fetch_flights)
+
+    asyncio.run(flight_service.get_flight_details("Mumbai", "Delhi", "2025-12-15"))
+
+    key, = flight_service._FLIGHT_CACHE
+    assert flight_service._FLIGHT_CACHE.expires_at(key) - time.monotonic() <= flight_service.EMPTY_TTL
+
+
+def test_cache_is_bounded(monkeypatch):
+    async def fetch_flights(*args):
+        return {"best_flights": [{"price": 100}]}
+
+    monkeypatch.setattr(flight_service, "_fetch_flights", fetch_flights)
+    monkeypatch.setattr(flight_service._FLIGHT_CACHE, "maxsize", 2)
+
+    for day in ("2025-12-15", "2025-12-16", "2025-12-17"):
+        asyncio.run(flight_service.get_flight_details("Mumbai", "Delhi", day))
+
+    assert [key[2] for key in flight_service._FLIGHT_CACHE] == ["2025-12-16", "2025-12-17"]
@@ -0,0 +1,34 @@
+"""
+hotel_service tests against a mocked SearchAPI (httpx.MockTransport)
+"""
+
+import asyncio
+import time
+
+import httpx
+import orjson
+import pytest
+
+from services import hotel_service
+
+
+@pytest.fixture(autouse=True)
+def clear_hotel_cache():
+    hotel_service._HOTEL_CACHE.clear()
+    yield
+    hotel_service._HOTEL_CACHE.clear()
+
+
+def use_transport(monkeypatch, handler):
+    """Route hotel_service's SearchAPI calls through handler"""
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(hotel_service, "get_http_client", lambda: client)
+
+
+def test_search_without_properties_is_cached_briefly(monkeypatch):
+    use_transport(monkeypatch, lambda request: httpx.Response(200, content=orjson.dumps({"properties": []})))
+
+    asyncio.run(hotel_service.get_hotel_details("2025-12-15", "2025-12-18", "Goa"))
+
+    key, = hotel_service._HOTEL_CACHE
+    assert hotel_service._HOTEL_CACHE.expires_at(key) - time.monotonic() <= hotel_service.EMPTY_TTL
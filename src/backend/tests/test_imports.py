@@ -0,0 +1,16 @@
+"""
+Import smoke tests: every entry point must at least import
+"""
+
+import importlib
+
+import pytest
+
+
+@pytest.mark.parametrize("module", [
+    "services.db_checkpointer",
+    "services",
+    "main",
+])
+def test_module_imports(module):
+    importlib.import_module(module)
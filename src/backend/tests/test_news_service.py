@@ -0,0 +1,109 @@
+"""
+news_service tests against a mocked SearchAPI (httpx.MockTransport)
+"""
+
+import asyncio
+import time
+
+import httpx
+import orjson
+import pytest
+
+from services import news_service
+
+
+@pytest.fixture(autouse=True)
+def clear_news_cache():
+    news_service._NEWS_CACHE.clear()
+    yield
+    news_service._NEWS_CACHE.clear()
+
+
+def use_transport(monkeypatch, handler):
+    """Route news_service's SearchAPI calls through handler"""
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(news_service, "get_http_client", lambda: client)
+
+
+ARTICLE = {"position": 1, "title": "Japan reopens", "source": "Reuters", "date": "1 day ago", "snippet": "..."}
+
+
+def test_not_modified_serves_cached_articles(monkeypatch):
+    seen_etags = []
+
+    def handler(request):
+        seen_etags.append(request.headers.get("if-none-match"))
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304, headers={"ETag": '"v1"'})
+        # max-age=0: the entry expires at once, so the next call revalidates
+        return httpx.Response(
+            200,
+            headers={"ETag": '"v1"', "Cache-Control": "max-age=0"},
+            content=orjson.dumps({"organic_results": [ARTICLE]}),
+        )
+
+    use_transport(monkeypatch, handler)
+
+    first = asyncio.run(news_service.get_news("travel to Japan"))
+    second = asyncio.run(news_service.get_news("travel to Japan"))
+
+    assert seen_etags == [None, '"v1"']
+    assert second == first
+    assert second["organic_results"][0]["title"] == "Japan reopens"
+
+
+def test_parse_news_data_tolerates_null_source_and_date():
+    articles = [
+        ARTICLE,
+        {"title": "No source", "source": None, "date": None, "snippet": "..."},
+        {"title": "Odd source", "source": {"name": "AP"}, "snippet": "..."},
+    ]
+
+    toon, full_data = news_service.parse_news_data({"organic_results": articles})
+
+    assert [a["source"] for a in full_data["articles"]] == ["Reuters", "N/A", "N/A"]
+    assert [a["date"] for a in full_data["articles"]] == ["1 day ago", "N/A", "N/A"]
+    assert toon.count("\n") == 4  # header + one row per article
+
+
+def test_concurrent_identical_queries_share_one_request(monkeypatch):
+    requests = []
+
+    async def handler(request):
+        requests.append(request)
+        await asyncio.sleep(0.01)
+        return httpx.Response(500)
+
+    use_transport(monkeypatch, handler)
+    # No retries, so the call fails right away
+    monkeypatch.setattr(news_service, "_request_news", news_service._request_news.retry_with(stop=lambda _: True))
+
+    async def run():
+        first = asyncio.create_task(news_service.get_news("travel to Japan"))
+        await asyncio.sleep(0)
+        rest = [news_service.get_news("Travel to Japan ") for _ in range(4)]
+        return await asyncio.gather(first, *rest)
+
+    results = asyncio.run(run())
+
+    # The failure isn't cached, but every concurrent caller shares the one request
+    assert len(requests) == 1
+    assert results == [{}] * 5
+    assert news_service._NEWS_INFLIGHT == {}
+
+
+def test_failed_and_empty_results_are_not_pinned(monkeypatch):
+    responses = [httpx.Response(503), httpx.Response(200, content=b'{"organic_results": []}')]
+
+    use_transport(monkeypatch, lambda request: responses.pop(0))
+    monkeypatch.setattr(news_service, "_request_news", news_service._request_news.retry_with(stop=lambda _: True))
+
+    # A failed fetch is never cached
+    assert asyncio.run(news_service.get_news("travel to Japan")) == {}
+    assert len(news_service._NEWS_CACHE) == 0
+
+    # An empty answer is cached, but only for EMPTY_TTL
+    asyncio.run(news_service.get_news("travel to Japan"))
+    key, = news_service._NEWS_CACHE
+    assert news_service._NEWS_CACHE.peek(key)[0] == {"organic_results": []}
+    assert news_service._NEWS_CACHE.expires_at(key) - time.monotonic() <= news_service.EMPTY_TTL